@@ -3,6 +3,7 @@
 # ==============================================================================
 import streamlit as st
 from utils.styling import apply_global_styles
+from utils.g_sheets_connector import get_unidades
 
 # ==============================================================================
 # 2. CONFIGURAÇÃO DA PÁGINA PRINCIPAL E NAVEGAÇÃO
@@ -29,8 +30,18 @@ pg = st.navigation([
     st.Page("pages/fluxodecaixa.py", title="Fluxo de Caixa", icon="💰"),
     # Link para a página de registro de retiradas específicas.
     st.Page("pages/retiradas.py", title="Retiradas", icon="💸"),
+    # Link para a página com os totais consolidados de todas as unidades.
+    st.Page("pages/unidades.py", title="Unidades", icon="🏢"),
+    # Link para a página com o resultado da conciliação agendada.
+    st.Page("pages/conciliacao.py", title="Conciliação", icon="🧾"),
 ])
 
+# Quando há mais de uma unidade (planilha) configurada, o usuário escolhe aqui
+# qual delas as páginas de valores, caixa e retiradas devem usar.
+unidades = get_unidades()
+if len(unidades) > 1:
+    st.sidebar.selectbox("Unidade", [nome for nome, _ in unidades], key="unidade_ativa")
+
 caminho_logo = "images/Brasao32BPMM.png"
 st.sidebar.image(caminho_logo, width=200) # Aumente ou diminua este valor
 
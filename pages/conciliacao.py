@@ -0,0 +1,98 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import streamlit as st
+from utils.styling import apply_global_styles, render_card
+from utils.g_sheets_connector import get_gspread_client, get_unidades
+from utils.conciliacao import get_conciliacao, INTERVALO_CONCILIACAO
+
+# ==============================================================================
+# 2. INÍCIO DA INTERFACE DO APLICATIVO
+# ==============================================================================
+apply_global_styles()
+
+st.subheader("Conciliação: Formulário x Fluxo de Caixa x Retiradas")
+st.caption(
+    f"A conciliação é executada em segundo plano a cada {INTERVALO_CONCILIACAO // 60} minutos "
+    "sobre todo o histórico. Esta página apenas exibe o último resultado."
+)
+
+client = get_gspread_client()
+if not client:
+    st.error("A conexão com o Google Sheets falhou. Não é possível carregar os dados.")
+    st.stop()
+
+# A tarefa é criada uma única vez por processo; os reruns só leem o estado dela.
+tarefa = get_conciliacao(client, get_unidades())
+if tarefa.resultado is None and tarefa.erro is None:
+    with st.spinner("Executando a primeira conciliação..."):
+        tarefa.aguardar_primeira_execucao(timeout=120)
+
+resultado, atualizado_em, erro = tarefa.estado()
+
+col1, col2 = st.columns([4, 1])
+if atualizado_em:
+    col1.write(f"Última conciliação: {atualizado_em.strftime('%d/%m/%Y %H:%M:%S')}")
+if col2.button("Conciliar agora", key="conciliar_agora_btn"):
+    tarefa.executar_agora()
+    st.info("Conciliação solicitada. Atualize a página em alguns instantes.")
+
+if erro:
+    st.error(f"A última conciliação falhou: {erro}")
+
+if resultado is not None:
+    for erro_unidade in resultado["erros"]:
+        st.warning(f"Dados incompletos da unidade {erro_unidade}")
+
+    periodos = resultado["periodos"]
+    unidades = resultado["unidades"]
+    sem_lancamento = resultado["retiradas_sem_lancamento"]
+    sem_retirada = resultado["lancamentos_sem_retirada"]
+
+    # ==============================================================================
+    # 3. RESUMO
+    # ==============================================================================
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        render_card(
+            label="Períodos divergentes",
+            value=str(int(periodos["Divergente"].sum())),
+            content=f"De {len(periodos)} períodos conciliados.",
+        )
+    with col2:
+        render_card(
+            label="Retiradas sem lançamento",
+            value=str(len(sem_lancamento)),
+            content="Retiradas que não aparecem no fluxo de caixa.",
+        )
+    with col3:
+        render_card(
+            label="Saídas sem retirada",
+            value=str(len(sem_retirada)),
+            content="Saídas do caixa sem registro na aba de retiradas.",
+        )
+
+    formato_moeda = "R$ {:,.2f}"
+
+    st.write("**Saldo por unidade**")
+    st.dataframe(
+        unidades.style.format({col: formato_moeda for col in unidades.columns if col != "Divergente"}),
+        use_container_width=True,
+    )
+
+    # ==============================================================================
+    # 4. DETALHAMENTO
+    # ==============================================================================
+    st.write("**Diferenças por período**")
+    apenas_divergentes = st.toggle("Mostrar apenas períodos divergentes", value=True, key="apenas_divergentes")
+    tabela = periodos[periodos["Divergente"]] if apenas_divergentes else periodos
+    tabela = tabela.reset_index().astype({"Período": str})
+    st.dataframe(
+        tabela.style.format({col: formato_moeda for col in periodos.columns if col != "Divergente"}),
+        use_container_width=True, hide_index=True,
+    )
+
+    with st.expander(f"Retiradas sem lançamento no caixa ({len(sem_lancamento)})"):
+        st.dataframe(sem_lancamento, use_container_width=True, hide_index=True)
+    with st.expander(f"Saídas do caixa sem retirada correspondente ({len(sem_retirada)})"):
+        st.dataframe(sem_retirada, use_container_width=True, hide_index=True)
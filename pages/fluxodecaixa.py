@@ -6,7 +6,8 @@ import pandas as pd
 import plotly.express as px
 import gspread
 from utils.styling import apply_global_styles
-from utils.g_sheets_connector import get_gspread_client
+from utils.g_sheets_connector import get_gspread_client, get_unidade_ativa
+from utils.dataset_cache import ler_aba
 
 # ==============================================================================
 # 2. CONFIGURAÇÃO DAS COLUNAS 
@@ -17,17 +18,13 @@ COLUNA_VALOR = "LANÇAMENTOS"
 # ==============================================================================
 # 3. FUNÇÃO DE CARREGAMENTO DE DADOS 
 # ==============================================================================
-@st.cache_data(ttl=10)
-def load_fluxo_caixa_data(_client):
+def load_fluxo_caixa_data(client, chave=None):
     
     try:
-        spreadsheet = _client.open("Previsao_de_Rancho")
-        worksheet = spreadsheet.worksheet("FLUXO DE CAIXA")
-        data = worksheet.get_all_records()
-        if not data:
+        df = ler_aba(client, chave, "FLUXO DE CAIXA")
+        if df.empty:
             st.info("A aba 'FLUXO DE CAIXA' está vazia.")
             return pd.DataFrame()
-        df = pd.DataFrame(data)
         if COLUNA_DATA in df.columns:
             df[COLUNA_DATA] = pd.to_datetime(df[COLUNA_DATA], format='%d/%m/%Y %H:%M:%S', errors='coerce').dt.tz_localize(None)
             df.dropna(subset=[COLUNA_DATA], inplace=True)
@@ -56,8 +53,9 @@ def load_fluxo_caixa_data(_client):
 apply_global_styles()
 
 client = get_gspread_client()
+_, chave_unidade = get_unidade_ativa()
 if client:
-    df_caixa = load_fluxo_caixa_data(client)
+    df_caixa = load_fluxo_caixa_data(client, chave_unidade)
 else:
     st.error("A conexão com o Google Sheets falhou.")
     df_caixa = pd.DataFrame()
@@ -3,19 +3,17 @@ import pandas as pd
 import gspread
 import plotly.express as px
 from utils.styling import apply_global_styles, render_card
-from utils.g_sheets_connector import get_gspread_client
+from utils.g_sheets_connector import get_gspread_client, get_unidade_ativa
+from utils.dataset_cache import ler_aba, ler_celula
+from utils.previsao import get_previsor, HORIZONTE
 
 # ==============================================================================
 # FUNÇÃO DE CARREGAMENTO DE DADOS
 # ==============================================================================
-@st.cache_data(ttl=10)
-def load_form_data(_client):
-    """Carrega dados da aba 'Respostas_ao_formulario_1'."""
+def load_form_data(client, chave=None):
+    """Carrega dados da aba 'Respostas_ao_formulario_1' (através do cache de dados)."""
     try:
-        spreadsheet = _client.open("Previsao_de_Rancho")
-        worksheet = spreadsheet.worksheet("Respostas_ao_formulario_1")
-        data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
+        df = ler_aba(client, chave, "Respostas_ao_formulario_1")
 
         # Tratamento de colunas de texto
         colunas_texto = ["Quitado", "RE (Sem dígito):"]
@@ -40,14 +38,11 @@ def load_form_data(_client):
         st.error(f"Erro ao carregar os dados do formulário: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=10)
-def load_total_arrecadado(_client):
+def load_total_arrecadado(client, chave=None):
     """Carrega o valor do total arrecadado da célula J1 da aba 'FLUXO DE CAIXA'."""
     try:
-        spreadsheet = _client.open("Previsao_de_Rancho")
-        worksheet = spreadsheet.worksheet("FLUXO DE CAIXA")
         # gspread.acell() é mais eficiente para buscar um único valor de célula.
-        total_value = worksheet.acell('J1').value
+        total_value = ler_celula(client, chave, "FLUXO DE CAIXA", 'J1')
         # Retorna o valor encontrado ou um padrão se a célula estiver vazia.
         return total_value if total_value else "R$ 0,00"
     except gspread.exceptions.WorksheetNotFound:
@@ -66,9 +61,10 @@ st.subheader("Visão Geral")
 # LÓGICA DE PAGAMENTO PENDENTE
 # ==============================================================================
 client = get_gspread_client()
+_, chave_unidade = get_unidade_ativa()
 if client:
-    df_form = load_form_data(client)
-    total_arrecadado_valor = load_total_arrecadado(client)
+    df_form = load_form_data(client, chave_unidade)
+    total_arrecadado_valor = load_total_arrecadado(client, chave_unidade)
 else:
     st.error("A conexão com o Google Sheets falhou. Não é possível carregar os dados.")
     df_form = pd.DataFrame()
@@ -210,3 +206,41 @@ R$ %{value:,.2f}<extra></extra>"""
             value="R$ 0,00",
             content="Sem dados de receita para exibir."
         )
+
+# ==============================================================================
+# PREVISÃO DE REFEIÇÕES
+# ==============================================================================
+# O modelo é reajustado em segundo plano apenas quando os dados do formulário
+# mudam; aqui só lemos a última previsão já calculada.
+if not df_form.empty:
+    previsor = get_previsor(chave_unidade)
+    previsor.atualizar(df_form)
+    previsao, previsao_atualizada_em, erro_previsao = previsor.estado()
+
+    st.subheader(f"Previsão para os próximos {HORIZONTE} dias")
+    if erro_previsao:
+        st.warning(f"Não foi possível calcular a previsão: {erro_previsao}")
+    elif previsao is None:
+        st.caption("A previsão está sendo calculada e aparecerá na próxima atualização da página.")
+    elif previsao.empty:
+        st.caption("Ainda não há histórico suficiente para prever as refeições.")
+    else:
+        dias_semana = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+        df_previsao = previsao.reset_index()
+        df_previsao["Dia"] = [
+            f"{dias_semana[data.dayofweek]} {data.strftime('%d/%m')}" for data in df_previsao["Data"]
+        ]
+        fig_previsao = px.bar(
+            df_previsao, x="Dia", y=["Café", "Almoço"], barmode="group", text_auto=True,
+            color_discrete_map={"Café": "#FFD700", "Almoço": "#28a745"},
+        )
+        fig_previsao.update_layout(
+            xaxis_title="", yaxis_title="Refeições", legend_title="", xaxis_type='category',
+            xaxis_fixedrange=True, yaxis_fixedrange=True,
+            paper_bgcolor='rgba(0,0,0,0)', height=300, margin=dict(l=0, r=0, t=10, b=0),
+        )
+        st.plotly_chart(fig_previsao, use_container_width=True, config={'displayModeBar': False})
+        st.caption(
+            "Média dos mesmos dias da semana nas últimas semanas, com mais peso para as recentes. "
+            f"Atualizada em {previsao_atualizada_em.strftime('%d/%m/%Y %H:%M:%S')}."
+        )
@@ -7,22 +7,21 @@ import streamlit as st                                  # Biblioteca principal p
 import pandas as pd                                     # Biblioteca para manipulação e análise de dados, usada aqui como um DataFrame.
 import gspread                                          # Biblioteca para interagir com a API do Google Sheets.
 from utils.styling import apply_global_styles           # Importa nossa função de estilo.
-from utils.g_sheets_connector import get_gspread_client # Importa a função de conexão centralizada que criamos.
+from utils.g_sheets_connector import get_gspread_client, get_unidade_ativa, get_worksheet, esquecer_worksheets # Importa a função de conexão centralizada que criamos.
+from utils.dataset_cache import ler_aba, get_dataset_cache # Cache de dados compartilhado, com limite de memória.
+from utils.constantes import COLUNA_DATA_FORM, FORMATO_DATA # Coluna e formato da data de cada resposta do formulário.
 
 # --- Funções de Conexão e Carregamento de Dados  ---
 
 # ==============================================================================
 # 2. FUNÇÃO DE CARREGAMENTO DE DADOS
 # ==============================================================================
-# Esta função é responsável por buscar os dados da planilha e armazená-los em cache.
-@st.cache_data(ttl=10)
-def load_data(_client):
+# Esta função é responsável por buscar os dados da planilha. A leitura passa pelo
+# cache de dados (utils/dataset_cache.py), que evita chamadas repetidas à API.
+def load_data(client, chave=None):
     """Carrega dados da aba 'Respostas_ao_formulario_1'."""
     try:
-        spreadsheet = _client.open("Previsao_de_Rancho")
-        worksheet_form = spreadsheet.worksheet("Respostas_ao_formulario_1")
-        data_form = worksheet_form.get_all_records()
-        df_form = pd.DataFrame(data_form) # Converte os dados recebidos em um DataFrame do Pandas.
+        df_form = ler_aba(client, chave, "Respostas_ao_formulario_1") # Já vem como um DataFrame do Pandas.
 
 
         # Colunas que devem ser tratadas como texto (string).
@@ -47,6 +46,50 @@ def load_data(_client):
         st.error(f"Erro ao carregar os dados: {e}")
         return pd.DataFrame() # Retorna um DataFrame vazio em caso de erro.
 
+# ==============================================================================
+# 2.1. FUNÇÃO DE QUITAÇÃO (ESCRITA NA PLANILHA)
+# ==============================================================================
+def quitar_linhas(client, chave, indices):
+    """
+    Marca "Quitado = Sim" nas linhas informadas com UMA única chamada de escrita.
+
+    As linhas são agrupadas em faixas contínuas (ex.: H2:H40, H45:H46) e todas
+    as faixas vão juntas em um `batch_update`. Quitar a unidade inteira custa
+    duas chamadas à API: o cabeçalho e a atualização.
+
+    Args:
+        client: Cliente do gspread.
+        chave: Chave da planilha da unidade (None para a planilha padrão).
+        indices: Índices das linhas no DataFrame carregado por `load_data`.
+
+    Returns:
+        int: Número de linhas atualizadas.
+    """
+    if len(indices) == 0:
+        return 0
+    try:
+        worksheet = get_worksheet(client, chave, "Respostas_ao_formulario_1")
+        header = worksheet.row_values(1) # Pega a primeira linha (cabeçalho).
+        # Letra da coluna "Quitado" (ex.: "H"), a partir da posição no cabeçalho.
+        coluna = gspread.utils.rowcol_to_a1(1, header.index("Quitado") + 1)[:-1]
+
+        # +2 porque o índice do Pandas começa em 0 e a planilha em 1, e ainda temos a linha do cabeçalho.
+        linhas = pd.Series(sorted(indices)).astype(int) + 2
+        faixa = (linhas.diff() != 1).cumsum() # Um novo número a cada quebra de sequência.
+        faixas = linhas.groupby(faixa).agg(["min", "max"])
+        dados = [
+            {"range": f"{coluna}{inicio}:{coluna}{fim}", "values": [["Sim"]] * int(fim - inicio + 1)}
+            for inicio, fim in faixas.itertuples(index=False)
+        ]
+        worksheet.batch_update(dados, value_input_option="RAW")
+    except gspread.exceptions.APIError:
+        esquecer_worksheets()
+        raise
+
+    # Descarta do cache os dados desta planilha, para que o rerun já leia os valores quitados.
+    get_dataset_cache().invalidar(chave)
+    return len(linhas)
+
 # --- Início da Lógica do Dashboard ---
 
 # ==============================================================================
@@ -77,10 +120,11 @@ if "busca_re_input" not in st.session_state:     # Guarda o valor digitado no ca
 # ==============================================================================
 # Tenta conectar ao Google Sheets e carregar os dados.
 client = get_gspread_client() # Chama nossa função de conexão centralizada.
+_, chave_unidade = get_unidade_ativa() # Unidade (planilha) selecionada na barra lateral.
 
 # Adiciona uma verificação para garantir que a conexão foi bem-sucedida antes de prosseguir.
 if client: # Se a conexão funcionou...
-    df = load_data(client) # ...carrega os dados da planilha.
+    df = load_data(client, chave_unidade) # ...carrega os dados da planilha.
 else: # Se a conexão falhou...
     st.error("A conexão com o Google Sheets falhou. Não é possível carregar os dados da página.")
     df = pd.DataFrame() # ...cria um DataFrame vazio para evitar que o resto do código quebre.
@@ -104,7 +148,12 @@ if not df.empty:
         st.session_state.resultado_busca = pd.DataFrame() # Limpa a tabela de resultados.
         st.session_state.busca_re_input = ""              # Limpa o campo de texto da busca.
         st.session_state.quitado_sucesso = False          # Reseta o "sinalizador" para não mostrar a mensagem de novo.
-        st.cache_data.clear()                             # Limpa o cache de dados para forçar uma nova busca na planilha na próxima interação.
+
+    # Uma quitação em lote (seção 7) também invalida a busca por RE, que poderia
+    # continuar mostrando como pendentes linhas que acabaram de ser quitadas.
+    if st.session_state.get("lote_quitado"):
+        st.session_state.resultado_busca = pd.DataFrame()
+        st.session_state.busca_re_input = ""
 
     # --------------------------------------------------------------------------
     # 6.2. LÓGICA DE BUSCA
@@ -177,35 +226,11 @@ if not df.empty:
                     # --------------------------------------------------------------------------
                     # 6.3.1. LÓGICA DE ATUALIZAÇÃO EM LOTE (BATCH UPDATE)
                     # --------------------------------------------------------------------------
-                    # Esta é a forma mais eficiente de atualizar múltiplas células. Em vez de
-                    # fazer uma chamada de API para cada célula, preparamos uma lista de
-                    # todas as mudanças e enviamos tudo de uma só vez.
-
-                    # Abre a planilha e a aba específica.
-                    spreadsheet = client.open("Previsao_de_Rancho")
-                    worksheet = spreadsheet.worksheet("Respostas_ao_formulario_1")
-                    
-                    header = worksheet.row_values(1) # Pega a primeira linha (cabeçalho).
-                    col_num = header.index("Quitado") + 1 # Encontra o número da coluna "Quitado" (+1 porque a contagem começa em 1).
-
-                    celulas_para_atualizar = [] # Cria uma lista vazia para armazenar as células que vamos modificar.
-
-                    # Itera sobre cada linha do DataFrame de resultado. O `.index` aqui se refere ao
-                    # índice original da linha no DataFrame `df` completo.
-                    for idx_pandas in resultado_salvo.index:
-                        # Ignora as linhas que já estão quitadas para não fazer trabalho desnecessário na API.
-                        if resultado_salvo.loc[idx_pandas, "Quitado"] != "Sim":
-                            # Calcula o índice da linha na Planilha Google.
-                            # (+2 porque o índice do Pandas começa em 0 e a planilha em 1, e ainda temos a linha do cabeçalho).
-                            idx_gspread = int(idx_pandas) + 2
-                            
-                            # Cria um objeto de célula (gspread.Cell) com a linha, coluna e o novo valor ("Sim").
-                            celula = gspread.Cell(row=idx_gspread, col=col_num, value="Sim")
-                            celulas_para_atualizar.append(celula) # Adiciona o objeto à nossa lista de atualizações.
-
-                    # Se a lista não estiver vazia, envia todas as atualizações de uma vez.
-                    if celulas_para_atualizar: 
-                        worksheet.update_cells(celulas_para_atualizar)
+                    # O `.index` do resultado se refere ao índice original da linha no DataFrame
+                    # `df` completo. As linhas já quitadas são ignoradas para não fazer trabalho
+                    # desnecessário na API; as demais são enviadas de uma só vez.
+                    indices_pendentes = resultado_salvo.index[resultado_salvo["Quitado"] != "Sim"]
+                    quitar_linhas(client, chave_unidade, indices_pendentes)
                     # --------------------------------------------------------------------------
 
                     # Define o "sinalizador" de sucesso como True.
@@ -225,7 +250,96 @@ else:
     st.warning("Não foi possível carregar os dados da Planilha Google para iniciar o dashboard.")
 
 # ==============================================================================
-# 7. EXPANSOR PARA VISUALIZAÇÃO DOS DADOS BRUTOS
+# 7. QUITAÇÃO EM LOTE
+# ==============================================================================
+# Permite quitar muitas pessoas de uma vez (ex.: dia do pagamento). A prévia é
+# calculada sobre os dados já carregados, sem chamar a API; só o botão final
+# grava na planilha, com uma única atualização em lote e um único rerun.
+if not df.empty and "Quitado" in df.columns and "TOTAL" in df.columns:
+    st.divider()
+    st.subheader("Quitação em Lote")
+
+    if st.session_state.get("lote_quitado"): # Mensagem do envio anterior, mostrada após o rerun.
+        pessoas, lancamentos, valor = st.session_state.pop("lote_quitado")
+        st.success(f"{lancamentos} lançamento(s) de {pessoas} pessoa(s) quitados, somando R$ {valor:,.2f}.")
+
+    coluna_re = "RE (Sem dígito):"
+    pendentes = df[df["Quitado"] != "Sim"]
+    filtro = pd.Series(True, index=pendentes.index)
+
+    col1, col2, col3 = st.columns(3)
+    if coluna_re in pendentes.columns:
+        nomes = pendentes.drop_duplicates(coluna_re).set_index(coluna_re).get("Nome de Guerra:", pd.Series(dtype=str))
+        res_selecionados = col1.multiselect(
+            "RE", sorted(pendentes[coluna_re].unique()), key="lote_res",
+            format_func=lambda re_: f"{re_} - {nomes.get(re_, '')}",
+            help="Deixe vazio para incluir todos os REs.",
+        )
+        if res_selecionados:
+            filtro &= pendentes[coluna_re].isin(res_selecionados)
+    if "Graduação:" in pendentes.columns:
+        graduacoes = col2.multiselect(
+            "Graduação", sorted(pendentes["Graduação:"].unique()), key="lote_graduacoes",
+            help="Deixe vazio para incluir todas as graduações.",
+        )
+        if graduacoes:
+            filtro &= pendentes["Graduação:"].isin(graduacoes)
+    if COLUNA_DATA_FORM in pendentes.columns:
+        datas = pd.to_datetime(pendentes[COLUNA_DATA_FORM], format=FORMATO_DATA, errors='coerce').dt.date
+        if datas.notna().any():
+            periodo = col3.date_input(
+                "Período", value=(datas.min(), datas.max()), key="lote_periodo", format="DD/MM/YYYY",
+                help="Lançamentos sem data válida só entram quando o período completo está selecionado.",
+            )
+            # O filtro só é aplicado quando o período é reduzido; assim, no período completo,
+            # os lançamentos com a data em branco ou inválida também são quitados.
+            # Enquanto o usuário escolhe as datas, o widget devolve só o início.
+            if len(periodo) == 2 and (periodo[0] > datas.min() or periodo[1] < datas.max()):
+                filtro &= datas.between(periodo[0], periodo[1])
+
+    selecionadas = pendentes[filtro]
+
+    # Prévia agrupada por pessoa, calculada sobre o snapshot em cache.
+    agregacoes = {"Lançamentos": ("TOTAL", "size"), "Total": ("TOTAL", "sum")}
+    for coluna, nome in [("Graduação:", "Graduação"), ("Nome de Guerra:", "Nome de Guerra")]:
+        if coluna in selecionadas.columns:
+            agregacoes = {nome: (coluna, "first"), **agregacoes}
+    chave_grupo = coluna_re if coluna_re in selecionadas.columns else selecionadas.index
+    previa = selecionadas.groupby(chave_grupo).agg(**agregacoes)
+
+    total_lote = selecionadas["TOTAL"].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric(label="PESSOAS", value=len(previa))
+    col2.metric(label="LANÇAMENTOS", value=len(selecionadas))
+    col3.metric(label="TOTAL A QUITAR", value=f"R$ {total_lote:,.2f}")
+
+    if not previa.empty:
+        st.dataframe(
+            previa.style.format({"Total": "R$ {:.2f}"})
+            .set_properties(**{'background-color': "#3D3A3A", 'color': 'white'}),
+            use_container_width=True,
+        )
+        confirmar = st.checkbox(
+            f"Confirmo a quitação de {len(selecionadas)} lançamento(s), somando R$ {total_lote:,.2f}.",
+            key="lote_confirmar",
+        )
+        if st.button("Quitar selecionados", key="quitar_lote_btn", disabled=not confirmar):
+            try:
+                quitados = quitar_linhas(client, chave_unidade, selecionadas.index)
+                st.session_state.lote_quitado = (len(previa), quitados, float(total_lote))
+                # Limpa os filtros e a confirmação para a próxima operação.
+                for chave_estado in ["lote_res", "lote_graduacoes", "lote_periodo", "lote_confirmar"]:
+                    st.session_state.pop(chave_estado, None)
+                st.rerun()
+            except gspread.exceptions.APIError as e:
+                st.error(f"Erro de API do Google: {e}. Verifique as permissões de Editor da conta de serviço.")
+            except Exception as e:
+                st.error(f"Erro ao tentar quitar os valores: {e}")
+    else:
+        st.info("Nenhum lançamento pendente para os filtros selecionados.")
+
+# ==============================================================================
+# 8. EXPANSOR PARA VISUALIZAÇÃO DOS DADOS BRUTOS
 # ==============================================================================
 # Oferece uma forma de visualizar todos os dados da planilha, útil para depuração.
 if not df.empty: # Só mostra o expansor se os dados foram carregados.
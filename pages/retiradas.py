@@ -2,13 +2,133 @@
 # 1. IMPORTAÇÃO DAS BIBLIOTECAS
 # ==============================================================================
 import streamlit as st                                  # Biblioteca principal para criar a interface web.
+import pandas as pd                                     # Usado para validar os lançamentos em lote de uma só vez.
 import gspread                                          # Biblioteca para interagir com a API do Google Sheets.
+import re                                               # Usado para reconhecer os formatos de valor aceitos no lote.
 from datetime import datetime                           # Módulo para obter a data e hora atuais.
 from utils.styling import apply_global_styles           # Importa nossa função de estilo.
-from utils.g_sheets_connector import get_gspread_client # Importa nossa função de conexão centralizada.
+from utils.g_sheets_connector import get_gspread_client, get_unidade_ativa, get_worksheet, esquecer_worksheets # Importa nossa função de conexão centralizada.
+from utils.dataset_cache import get_dataset_cache           # Cache de dados compartilhado entre as páginas.
+from utils.constantes import FORMATO_DATA               # Formato de data/hora usado em todas as abas.
 
 # ==============================================================================
-# 2. INTERFACE DO USUÁRIO
+# 2. ACESSO À ABA DE RETIRADAS
+# ==============================================================================
+SHEET_NAME = "RETIRADAS" # Nome da aba de destino.
+HEADER = ["Data/Hora", "Motivo", "Local", "Produto/Descrição", "Valor"]
+
+
+def enviar_retiradas(linhas):
+    """
+    Grava as linhas na aba 'RETIRADAS' da unidade ativa com UMA chamada à API
+    (`append_rows`) e mostra o resultado ao usuário.
+
+    Args:
+        linhas (list): Listas no formato de `HEADER`.
+
+    Returns:
+        bool: True se as linhas foram gravadas.
+    """
+    client = get_gspread_client() # Obtém o cliente de conexão com o Google Sheets.
+    nome_unidade, chave_unidade = get_unidade_ativa() # Unidade (planilha) selecionada na barra lateral.
+    if not client: # Procede apenas se a conexão foi bem-sucedida.
+        st.error("A conexão com o Google Sheets falhou.")
+        return False
+    try:
+        # A aba é criada com o cabeçalho se ainda não existir nesta unidade.
+        worksheet = get_worksheet(client, chave_unidade, SHEET_NAME, cabecalho=tuple(HEADER))
+        worksheet.append_rows(linhas, value_input_option='USER_ENTERED')
+        get_dataset_cache().invalidar(chave_unidade) # Os próximos acessos já leem as retiradas novas.
+        return True
+
+    # Tratamento de erros específicos e genéricos.
+    except gspread.exceptions.SpreadsheetNotFound:
+        st.error(f"Erro: A planilha da unidade '{nome_unidade}' não foi encontrada. Verifique o nome e as permissões da sua conta de serviço.")
+    except gspread.exceptions.APIError as e:
+        esquecer_worksheets()
+        st.error(f"Erro de API do Google: {e}. Verifique as permissões de Editor da conta de serviço.")
+    except Exception as e:
+        st.error(f"Ocorreu um erro ao tentar enviar os dados: {e}")
+    return False
+
+
+# ==============================================================================
+# 3. VALIDAÇÃO DOS LANÇAMENTOS EM LOTE
+# ==============================================================================
+# "Data/Hora" é opcional: permite lançar comprovantes antigos com a data real.
+# Deixada em branco, a linha recebe o horário do envio.
+COLUNAS_LOTE = ["Data/Hora", "Motivo", "Local", "Produto/Descrição", "Valor"]
+
+# Formatos aceitos para valores digitados como texto (após remover "R$" e espaços).
+NUMERO_SIMPLES = re.compile(r"-?\d+(\.\d{1,2})?")                      # 12 | 12.5 | 12.50
+NUMERO_BR = re.compile(r"-?\d{1,3}(\.\d{3})*(,\d+)?|-?\d+(,\d+)?")      # 1.234,56 | 1234,56 | 12,5
+
+
+def _converter_valores(valores):
+    """
+    Aceita números e textos como '12.5', '12,50', 'R$ 1.234,56' ou '-30'.
+    Textos em qualquer outro formato (como '1,234.56') viram NaN, para que a
+    linha seja marcada como 'Valor inválido' em vez de gravada com outro valor.
+    """
+    eh_texto = valores.map(lambda v: isinstance(v, str))
+    numeros = pd.to_numeric(valores.where(~eh_texto), errors='coerce')
+
+    texto = valores[eh_texto].astype(str).str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
+    simples = texto.str.fullmatch(NUMERO_SIMPLES)
+    brasileiro = texto.str.fullmatch(NUMERO_BR) & ~simples
+    convertidos = pd.concat([
+        pd.to_numeric(texto[simples]),
+        pd.to_numeric(texto[brasileiro].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)),
+    ])
+    return numeros.fillna(convertidos)
+
+
+def validar_lote(df):
+    """
+    Valida todos os lançamentos de uma vez, sem percorrer linha a linha.
+
+    Returns:
+        tuple: (validas, invalidas). `validas` tem as colunas de `COLUNAS_LOTE`
+        com o valor já negativo e a data em `FORMATO_DATA` (vazia quando não
+        informada); `invalidas` traz a coluna 'Erro' com o motivo.
+    """
+    df = df.reindex(columns=COLUNAS_LOTE)
+    textos = df[["Data/Hora", "Motivo", "Local", "Produto/Descrição"]].fillna("").astype(str).apply(lambda c: c.str.strip())
+    valores = _converter_valores(df["Valor"]).round(2) # Centavos, como gravado na planilha.
+    datas = pd.to_datetime(textos["Data/Hora"].where(textos["Data/Hora"] != ""), format=FORMATO_DATA, errors='coerce')
+
+    # Linhas totalmente vazias (comuns no editor) são simplesmente ignoradas.
+    vazias = (textos == "").all(axis=1) & df["Valor"].isna()
+    textos, valores, datas = textos[~vazias], valores[~vazias], datas[~vazias]
+
+    erros = pd.Series("", index=textos.index)
+    erros += ((textos["Data/Hora"] != "") & datas.isna()).map({True: "Data/Hora inválida (use dd/mm/aaaa hh:mm:ss). ", False: ""})
+    erros += (textos["Motivo"] == "").map({True: "Motivo obrigatório. ", False: ""})
+    erros += (textos["Produto/Descrição"] == "").map({True: "Produto obrigatório. ", False: ""})
+    erros += valores.isna().map({True: "Valor inválido. ", False: ""})
+    erros += (valores == 0).map({True: "Valor não pode ser zero. ", False: ""})
+
+    lote = textos.assign(
+        **{"Data/Hora": datas.dt.strftime(FORMATO_DATA).fillna(textos["Data/Hora"])},
+        Valor=-valores.abs(), # Toda retirada é gravada como valor negativo.
+    )
+    validas = lote[erros == ""]
+    invalidas = lote[erros != ""].assign(Erro=erros[erros != ""].str.strip())
+    return validas, invalidas
+
+
+def ler_csv(arquivo):
+    """Lê um CSV separado por ';' ou ',' com as colunas de `COLUNAS_LOTE` ('Local' e 'Data/Hora' são opcionais)."""
+    df = pd.read_csv(arquivo, sep=None, engine="python", dtype=str, encoding="utf-8-sig")
+    df.columns = df.columns.str.strip()
+    faltando = [col for col in ["Motivo", "Produto/Descrição", "Valor"] if col not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no arquivo: {', '.join(faltando)}")
+    return df
+
+
+# ==============================================================================
+# 4. INTERFACE DO USUÁRIO
 # ==============================================================================
 
 # Aplica os estilos globais definidos no arquivo .streamlit/style.css
@@ -18,76 +138,100 @@ apply_global_styles()
 st.subheader("Lançamento de Retiradas")
 st.write("Aqui você pode registrar as saídas do caixa do Rancho.")
 
+aba_unica, aba_lote = st.tabs(["Registro único", "Lançamento em lote"])
+
 # ==============================================================================
-# 3. FORMULÁRIO DE ENTRADA DE DADOS
+# 5. FORMULÁRIO DE ENTRADA DE DADOS
 # ==============================================================================
 # `st.form` é usado para agrupar vários campos de entrada. Os dados só são enviados
 # quando o botão de submissão dentro do formulário é clicado.
 # `clear_on_submit=True` limpa os campos do formulário após o envio bem-sucedido.
-col1, col2, col3 = st.columns(3)
-with col1:
-
-    with st.form(key="RETIRADAS_form", clear_on_submit=True):
-        # Campos de entrada de texto e número para o usuário preencher.
-        motivo = st.text_input("Motivo*", help="Ex: Compra de material de limpeza, Venda de bebidas")
-        local = st.text_input("Local", help="Ex: Supermercado X, Cantina")
-        produto = st.text_input("Produto/Descrição*", help="Ex: Água sanitária, Detergente, Refrigerante")
-        
-        # Campo de valor. Note que pedimos um valor positivo para facilitar a digitação do usuário.
-        valor_input = st.number_input("Valor (R$)*", min_value=0.0, format="%.2f", help="Use somente valores positivos, ele será convertido automaticamente para negativo.")
-        
-        # Botão de submissão do formulário.
-        submit_button = st.form_submit_button(label="Enviar Registro")
-    
+with aba_unica:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+
+        with st.form(key="RETIRADAS_form", clear_on_submit=True):
+            # Campos de entrada de texto e número para o usuário preencher.
+            motivo = st.text_input("Motivo*", help="Ex: Compra de material de limpeza, Venda de bebidas")
+            local = st.text_input("Local", help="Ex: Supermercado X, Cantina")
+            produto = st.text_input("Produto/Descrição*", help="Ex: Água sanitária, Detergente, Refrigerante")
+            
+            # Campo de valor. Note que pedimos um valor positivo para facilitar a digitação do usuário.
+            valor_input = st.number_input("Valor (R$)*", min_value=0.0, format="%.2f", help="Use somente valores positivos, ele será convertido automaticamente para negativo.")
+            
+            # Botão de submissão do formulário.
+            submit_button = st.form_submit_button(label="Enviar Registro")
+
+    # Este bloco de código só é executado quando o `submit_button` é pressionado.
+    if submit_button:
+        # Verifica se os campos obrigatórios foram preenchidos.
+        if not motivo or not produto or valor_input == 0:
+            st.warning("Por favor, preencha todos os campos obrigatórios (*) com valores válidos.")
+        else:
+            # Converte o valor positivo inserido pelo usuário em um valor negativo,
+            # pois esta página registra apenas retiradas (saídas de caixa).
+            valor = round(valor_input, 2) * -1
+
+            # Prepara a nova linha de dados para ser inserida.
+            timestamp = datetime.now().strftime(FORMATO_DATA) # Formata a data/hora atual no padrão brasileiro.
+            new_row = [timestamp, motivo, local, produto, valor] # Monta a lista com os dados.
+
+            if enviar_retiradas([new_row]):
+                # Fornece feedback de sucesso ao usuário.
+                st.success("Registro enviado com sucesso para a planilha!")
+                #st.balloons() # Balões 
+
 # ==============================================================================
-# 4. LÓGICA DE SUBMISSÃO DO FORMULÁRIO
+# 6. LANÇAMENTO EM LOTE (EDITOR OU CSV)
 # ==============================================================================
-# Este bloco de código só é executado quando o `submit_button` é pressionado.
-if submit_button:
-    # --------------------------------------------------------------------------
-    # 4.1. VALIDAÇÃO E PROCESSAMENTO DOS DADOS DE ENTRADA
-    # --------------------------------------------------------------------------
-    # Verifica se os campos obrigatórios foram preenchidos.
-    if not motivo or not produto or valor_input == 0:
-        st.warning("Por favor, preencha todos os campos obrigatórios (*) com valores válidos.")
+# Todas as linhas são validadas localmente e enviadas juntas com um único
+# `append_rows`: 100 retiradas custam uma chamada à API, e não centenas.
+with aba_lote:
+    if "lote_versao" not in st.session_state: # Trocar a versão recria o editor vazio após um envio.
+        st.session_state.lote_versao = 0
+    if st.session_state.get("lote_enviado"):
+        st.success(f"{st.session_state.pop('lote_enviado')} retiradas enviadas com sucesso para a planilha!")
+
+    origem = st.radio("Origem dos dados", ["Digitar na tabela", "Importar CSV"], horizontal=True, key="lote_origem")
+    if origem == "Digitar na tabela":
+        df_lote = st.data_editor(
+            pd.DataFrame(columns=COLUNAS_LOTE).astype({"Valor": float}),
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={
+                "Data/Hora": st.column_config.TextColumn(
+                    "Data/Hora", help="dd/mm/aaaa hh:mm:ss. Deixe em branco para usar o horário do envio.",
+                ),
+                "Valor": st.column_config.NumberColumn("Valor (R$)", min_value=0.0, format="%.2f"),
+            },
+            key=f"lote_editor_{st.session_state.lote_versao}",
+        )
     else:
-        # Converte o valor positivo inserido pelo usuário em um valor negativo,
-        # pois esta página registra apenas retiradas (saídas de caixa).
-        valor = valor_input * -1
-
-        # --------------------------------------------------------------------------
-        # 4.2. ENVIO DOS DADOS PARA A PLANILHA
-        # --------------------------------------------------------------------------
-        client = get_gspread_client() # Obtém o cliente de conexão com o Google Sheets.
-        if client: # Procede apenas se a conexão foi bem-sucedida.
+        arquivo = st.file_uploader(
+            "Arquivo CSV com as colunas Motivo, Local, Produto/Descrição e Valor (e, opcionalmente, Data/Hora)",
+            type="csv", key=f"lote_csv_{st.session_state.lote_versao}",
+        )
+        df_lote = pd.DataFrame(columns=COLUNAS_LOTE)
+        if arquivo is not None:
             try:
-                # Abre a planilha pelo nome.
-                spreadsheet = client.open("Previsao_de_Rancho")
-                sheet_name = "RETIRADAS" # Define o nome da aba de destino.
-                
-                # Tenta acessar a aba. Se não existir, cria uma nova.
-                try:
-                    worksheet = spreadsheet.worksheet(sheet_name)
-                except gspread.exceptions.WorksheetNotFound:
-                    st.info(f"Aba '{sheet_name}' não encontrada. Criando uma nova...")
-                    worksheet = spreadsheet.add_worksheet(title=sheet_name, rows="100", cols="10")
-                    # Adiciona o cabeçalho à nova aba.
-                    header = ["Data/Hora", "Motivo", "Local", "Produto/Descrição", "Valor"]
-                    worksheet.append_row(header, value_input_option='USER_ENTERED')
-
-                # Prepara a nova linha de dados para ser inserida.
-                timestamp = datetime.now().strftime('%d/%m/%Y %H:%M:%S') # Formata a data/hora atual no padrão brasileiro.
-                new_row = [timestamp, motivo, local, produto, valor] # Monta a lista com os dados.
-                
-                # Adiciona a nova linha ao final da planilha.
-                worksheet.append_row(new_row, value_input_option='USER_ENTERED')
-                
-                # Fornece feedback de sucesso ao usuário.
-                st.success("Registro enviado com sucesso para a planilha!")
-                #st.balloons() # Balões 
+                df_lote = ler_csv(arquivo)
+            except Exception as e:
+                st.error(f"Não foi possível ler o arquivo: {e}")
+
+    validas, invalidas = validar_lote(df_lote)
+
+    if not invalidas.empty:
+        st.warning(f"{len(invalidas)} linha(s) com problemas. Corrija-as antes de enviar.")
+        st.dataframe(invalidas, use_container_width=True)
 
-            # Tratamento de erros específicos e genéricos.
-            except gspread.exceptions.SpreadsheetNotFound:
-                st.error("Erro: A planilha 'Previsao_de_Rancho' não foi encontrada. Verifique o nome e as permissões da sua conta de serviço.")
-            except ImportError as e:
-                st.error(f"Ocorreu um erro ao tentar enviar os dados: {e}")
+    if not validas.empty:
+        col1, col2 = st.columns([1, 4])
+        col1.metric(label="TOTAL DO LOTE", value=f"R$ {-validas['Valor'].sum():,.2f}")
+        if col2.button(f"Enviar {len(validas)} retirada(s)", key="enviar_lote_btn", disabled=not invalidas.empty):
+            timestamp = datetime.now().strftime(FORMATO_DATA)
+            datas_envio = validas["Data/Hora"].replace("", timestamp) # Linhas sem data recebem o horário do envio.
+            linhas = validas.assign(**{"Data/Hora": datas_envio})[HEADER].values.tolist()
+            if enviar_retiradas(linhas):
+                st.session_state.lote_enviado = len(linhas)
+                st.session_state.lote_versao += 1
+                st.rerun()
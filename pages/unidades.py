@@ -0,0 +1,71 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from utils.styling import apply_global_styles, render_card
+from utils.g_sheets_connector import get_gspread_client, get_unidades
+from utils.unidades import load_unidades
+
+# ==============================================================================
+# 2. INÍCIO DA INTERFACE DO APLICATIVO
+# ==============================================================================
+apply_global_styles()
+
+st.subheader("Consolidado das Unidades")
+
+unidades = get_unidades()
+client = get_gspread_client()
+if client:
+    resumo, erros = load_unidades(client, unidades)
+else:
+    st.error("A conexão com o Google Sheets falhou. Não é possível carregar os dados.")
+    resumo, erros = pd.DataFrame(), []
+
+# Uma unidade com problema não impede a exibição das outras.
+for erro in erros:
+    st.warning(f"Não foi possível carregar a unidade {erro}")
+
+if not resumo.empty:
+    # ==============================================================================
+    # 3. SELEÇÃO DA VISÃO (CONSOLIDADA OU POR UNIDADE)
+    # ==============================================================================
+    opcoes = ["Todas as unidades"] + list(resumo.index)
+    visao = st.selectbox("Visão", opcoes, key="visao_unidades")
+
+    # Os totais já vêm calculados do cache; aqui só selecionamos a linha ou somamos.
+    totais = resumo.sum() if visao == "Todas as unidades" else resumo.loc[visao]
+
+    # ==============================================================================
+    # 4. RENDERIZAÇÃO DOS CARDS
+    # ==============================================================================
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        render_card(label="Café", value=str(int(totais["Café"])), content="Para hoje")
+    with col2:
+        render_card(label="Almoço", value=str(int(totais["Almoço"])), content="Para hoje")
+    with col3:
+        render_card(label="Pendente", value=f"R$ {totais['Pendente']:,.2f}", content="Valores ainda não quitados.")
+    with col4:
+        render_card(label="Saldo do Caixa", value=f"R$ {totais['Saldo']:,.2f}", content="Soma dos lançamentos.")
+
+    # ==============================================================================
+    # 5. COMPARATIVO ENTRE UNIDADES
+    # ==============================================================================
+    if len(resumo) > 1:
+        df_grafico = resumo.reset_index()
+        fig = px.bar(
+            df_grafico, x="Unidade", y=["Pendente", "Saldo"], barmode="group",
+            color_discrete_map={"Pendente": "#ffc107", "Saldo": "#28a745"},
+        )
+        fig.update_layout(
+            xaxis_title="", yaxis_title="R$", legend_title="",
+            paper_bgcolor='rgba(0,0,0,0)', xaxis_fixedrange=True, yaxis_fixedrange=True,
+        )
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+    st.dataframe(
+        resumo.style.format({"Pendente": "R$ {:,.2f}", "Saldo": "R$ {:,.2f}"}),
+        use_container_width=True,
+    )
@@ -0,0 +1,77 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import threading                                        # A tarefa roda em uma thread separada do script do Streamlit.
+from datetime import datetime
+
+# ==============================================================================
+# 2. TAREFA PERIÓDICA EM SEGUNDO PLANO
+# ==============================================================================
+# Processamentos pesados (conciliação, previsões) não devem rodar a cada rerun
+# da página. Esta classe executa uma função em intervalos fixos em uma thread
+# própria e guarda o último resultado; as páginas apenas leem esse resultado.
+#
+# A instância deve ser criada dentro de uma função com @st.cache_resource, para
+# que exista uma única tarefa por processo, compartilhada entre as sessões.
+# A função executada NÃO pode chamar comandos do Streamlit (st.*), pois roda
+# fora do contexto de uma sessão.
+
+
+class TarefaPeriodica:
+    """
+    Executa `funcao()` a cada `intervalo` segundos em uma thread daemon.
+
+    Args:
+        nome (str): Nome da tarefa, usado no nome da thread.
+        funcao (callable): Função sem argumentos cujo retorno é guardado em `resultado`.
+        intervalo (float): Segundos entre duas execuções. Com None, a tarefa só
+            roda quando `executar_agora()` é chamado.
+        executar_ao_iniciar (bool): Se False, espera o primeiro `executar_agora()`
+            (ou o fim do intervalo) antes da primeira execução.
+    """
+
+    def __init__(self, nome, funcao, intervalo, executar_ao_iniciar=True):
+        self.nome = nome
+        self.funcao = funcao
+        self.intervalo = intervalo
+        self.executar_ao_iniciar = executar_ao_iniciar
+        self.resultado = None                           # Retorno da última execução bem-sucedida.
+        self.erro = None                                # Mensagem da última falha (None se a última execução deu certo).
+        self.atualizado_em = None                       # Data/hora da última execução bem-sucedida.
+        self._acordar = threading.Event()
+        self._concluida = threading.Event()             # Sinaliza que a primeira execução terminou.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name=f"tarefa-{nome}", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        if not self.executar_ao_iniciar:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+        while True:
+            try:
+                resultado = self.funcao()
+                with self._lock:
+                    self.resultado = resultado
+                    self.erro = None
+                    self.atualizado_em = datetime.now()
+            except Exception as e:
+                with self._lock:
+                    self.erro = str(e)
+            self._concluida.set()
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+
+    def executar_agora(self):
+        """Antecipa a próxima execução, sem esperar o fim do intervalo. Pedidos
+        feitos durante uma execução resultam em uma única nova execução."""
+        self._acordar.set()
+
+    def aguardar_primeira_execucao(self, timeout=None):
+        """Bloqueia até a primeira execução terminar. Retorna False se o tempo esgotar."""
+        return self._concluida.wait(timeout)
+
+    def estado(self):
+        """Retorna (resultado, atualizado_em, erro) de forma consistente entre threads."""
+        with self._lock:
+            return self.resultado, self.atualizado_em, self.erro
@@ -0,0 +1,206 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import streamlit as st                                  # Usado apenas para manter uma única tarefa agendada por processo.
+import pandas as pd                                     # Todas as comparações são feitas com operações vetorizadas.
+from utils.agendador import TarefaPeriodica
+from utils.constantes import COLUNA_DATA_FORM, FORMATO_DATA
+from utils.g_sheets_connector import identidade_client
+from utils.unidades import carregar_abas
+
+# ==============================================================================
+# 2. CONFIGURAÇÃO
+# ==============================================================================
+ABA_FORMULARIO = "Respostas_ao_formulario_1"
+ABA_CAIXA = "FLUXO DE CAIXA"
+ABA_RETIRADAS = "RETIRADAS"
+
+TOLERANCIA = 0.01                                       # Diferenças até 1 centavo são consideradas arredondamento.
+JANELA_RETIRADA = pd.Timedelta(days=2)                  # Distância máxima entre a retirada e seu lançamento no caixa.
+JANELA_QUITACAO = pd.Timedelta(days=7)                  # Prazo normal entre o pedido no formulário e o pagamento no caixa.
+INTERVALO_CONCILIACAO = 15 * 60                         # A conciliação roda a cada 15 minutos, não a cada rerun.
+
+
+def _datas(df, coluna):
+    if coluna not in df.columns:
+        return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    return pd.to_datetime(df[coluna], format=FORMATO_DATA, errors='coerce')
+
+
+def _valores(df, coluna):
+    if coluna not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[coluna], errors='coerce').fillna(0).astype(float)
+
+
+# ==============================================================================
+# 3. CONCILIAÇÃO
+# ==============================================================================
+def _por_periodo(df, valor, nome, freq):
+    """Soma `valor` por unidade e período, descartando linhas sem data válida."""
+    validos = df["Data"].notna()
+    return (
+        df.loc[validos].assign(Período=df.loc[validos, "Data"].dt.to_period(freq), Valor=valor[validos])
+        .groupby(["Unidade", "Período"])["Valor"].sum()
+        .rename(nome)
+    )
+
+
+def _casar_retiradas(retiradas, saidas):
+    """
+    Casa cada retirada com um lançamento negativo do caixa de mesmo valor (em
+    centavos), da mesma unidade, no intervalo de `JANELA_RETIRADA`. O casamento
+    é um-para-um: cada retirada usa no máximo um lançamento e vice-versa.
+
+    Cada rodada do `merge_asof` liga as retiradas ao lançamento mais próximo;
+    quando duas disputam o mesmo lançamento, fica a mais próxima e a outra volta
+    para a rodada seguinte, já sem os pares formados. Repete até não haver
+    novos pares (normalmente uma ou duas rodadas).
+    """
+    esquerda = retiradas.dropna(subset=["Data"]).sort_values("Data")
+    direita = saidas.dropna(subset=["Data"]).sort_values("Data")
+    direita = direita.assign(Data_caixa=direita["Data"], Linha_caixa=direita.index)[
+        ["Data", "Unidade", "Centavos", "Data_caixa", "Linha_caixa"]
+    ]
+    livres_esquerda = esquerda.assign(Linha_retirada=esquerda.index)
+    livres_direita = direita
+    linhas_retirada, linhas_caixa = [], []
+
+    while not livres_esquerda.empty and not livres_direita.empty:
+        casadas = pd.merge_asof(
+            livres_esquerda[["Data", "Unidade", "Centavos", "Linha_retirada"]], livres_direita,
+            on="Data", by=["Unidade", "Centavos"], tolerance=JANELA_RETIRADA, direction="nearest",
+        ).dropna(subset=["Linha_caixa"])
+        if casadas.empty:
+            break
+        # Cada lançamento fica com a retirada mais próxima dele.
+        casadas = (
+            casadas.assign(Distancia=(casadas["Data"] - casadas["Data_caixa"]).abs())
+            .sort_values("Distancia")
+            .drop_duplicates("Linha_caixa")
+        )
+        linhas_retirada.extend(casadas["Linha_retirada"])
+        linhas_caixa.extend(casadas["Linha_caixa"])
+        livres_esquerda = livres_esquerda[~livres_esquerda["Linha_retirada"].isin(casadas["Linha_retirada"])]
+        livres_direita = livres_direita[~livres_direita["Linha_caixa"].isin(casadas["Linha_caixa"])]
+
+    sem_lancamento = retiradas[~retiradas.index.isin(linhas_retirada)]
+    sem_retirada = saidas[~saidas.index.isin(linhas_caixa)]
+    return sem_lancamento, sem_retirada
+
+
+def conciliar(df_form, df_caixa, df_retiradas, freq="M"):
+    """
+    Confere o formulário, o fluxo de caixa e as retiradas de todas as unidades.
+
+    - Por período: o total marcado como "Quitado = Sim" é comparado com as
+      entradas do caixa, e o total da aba 'RETIRADAS' com as saídas do caixa.
+      O formulário é agrupado pela data do pedido e o caixa pela data do
+      pagamento, então as diferenças de cada período são apenas informativas.
+      Um período só é marcado como divergente quando a diferença acumulada
+      até o fim dele é maior que o valor ainda "em trânsito" (quitações
+      pedidas nos últimos `JANELA_QUITACAO` dias do período e retiradas dos
+      últimos `JANELA_RETIRADA` dias).
+    - Por lançamento: cada retirada deve ter uma saída correspondente no caixa.
+    - Por unidade: o saldo do caixa deve ser igual a quitações menos retiradas.
+
+    Args:
+        df_form, df_caixa, df_retiradas (pd.DataFrame): Abas de todas as
+            unidades, com a coluna 'Unidade' (ver `utils.unidades.carregar_abas`).
+        freq (str): Frequência dos períodos do pandas ("M" mensal, "W" semanal...).
+
+    Returns:
+        dict: DataFrames 'periodos', 'unidades', 'retiradas_sem_lancamento'
+        e 'lancamentos_sem_retirada'.
+    """
+    # --- Normalização vetorizada das três abas ---
+    form = pd.DataFrame({
+        "Unidade": df_form["Unidade"],
+        "Data": _datas(df_form, COLUNA_DATA_FORM),
+        "Quitado": df_form["Quitado"].astype(str) if "Quitado" in df_form.columns else "",
+    })
+    form_valor = _valores(df_form, "TOTAL").where(form["Quitado"] == "Sim", 0.0)
+
+    caixa = pd.DataFrame({"Unidade": df_caixa["Unidade"], "Data": _datas(df_caixa, "REGISTRO")})
+    caixa_valor = _valores(df_caixa, "LANÇAMENTOS")
+
+    retiradas = df_retiradas.assign(
+        Data=_datas(df_retiradas, "Data/Hora"),
+        # As retiradas são gravadas como negativas, mas aceitamos as digitadas com sinal trocado.
+        Valor=-_valores(df_retiradas, "Valor").abs(),
+    )
+    retiradas["Centavos"] = (retiradas["Valor"] * 100).round().astype("int64")
+
+    # --- Diferenças por período ---
+    periodos = pd.concat([
+        _por_periodo(form, form_valor, "Quitado (formulário)", freq),
+        _por_periodo(caixa, caixa_valor.clip(lower=0), "Entradas (caixa)", freq),
+        _por_periodo(retiradas, retiradas["Valor"], "Retiradas", freq),
+        _por_periodo(caixa, caixa_valor.clip(upper=0), "Saídas (caixa)", freq),
+    ], axis=1).fillna(0.0).sort_index()
+    periodos["Dif. entradas"] = periodos["Entradas (caixa)"] - periodos["Quitado (formulário)"]
+    periodos["Dif. saídas"] = periodos["Saídas (caixa)"] - periodos["Retiradas"]
+    periodos["Dif. acumulada"] = (
+        (periodos["Dif. entradas"] + periodos["Dif. saídas"]).groupby(level="Unidade").cumsum()
+    )
+    fim_form = form["Data"].dt.to_period(freq).dt.end_time
+    quitacao_recente = form["Data"] > fim_form - JANELA_QUITACAO
+    fim_retiradas = retiradas["Data"].dt.to_period(freq).dt.end_time
+    retirada_recente = retiradas["Data"] > fim_retiradas - JANELA_RETIRADA
+    em_transito = pd.concat([
+        _por_periodo(form[quitacao_recente], form_valor[quitacao_recente], "Quitações", freq),
+        _por_periodo(retiradas[retirada_recente], retiradas["Valor"].abs()[retirada_recente], "Retiradas", freq),
+    ], axis=1).sum(axis=1)
+    periodos["Em trânsito"] = em_transito.reindex(periodos.index).fillna(0.0)
+    periodos["Divergente"] = periodos["Dif. acumulada"].abs() > periodos["Em trânsito"] + TOLERANCIA
+
+    # --- Retiradas sem lançamento no caixa (e vice-versa) ---
+    saidas = caixa.assign(Valor=caixa_valor).loc[caixa_valor < 0].copy()
+    saidas["Centavos"] = (saidas["Valor"] * 100).round().astype("int64")
+    sem_lancamento, sem_retirada = _casar_retiradas(retiradas, saidas)
+
+    # --- Saldo por unidade ---
+    unidades = pd.concat([
+        form_valor.groupby(form["Unidade"]).sum().rename("Quitado (formulário)"),
+        retiradas.groupby("Unidade")["Valor"].sum().rename("Retiradas"),
+        caixa_valor.groupby(caixa["Unidade"]).sum().rename("Saldo (caixa)"),
+    ], axis=1).fillna(0.0)
+    unidades["Saldo esperado"] = unidades["Quitado (formulário)"] + unidades["Retiradas"]
+    unidades["Diferença"] = unidades["Saldo (caixa)"] - unidades["Saldo esperado"]
+    unidades["Divergente"] = unidades["Diferença"].abs() > TOLERANCIA
+
+    return {
+        "periodos": periodos,
+        "unidades": unidades,
+        "retiradas_sem_lancamento": sem_lancamento.drop(columns=["Centavos"]),
+        "lancamentos_sem_retirada": sem_retirada.drop(columns=["Centavos"]),
+    }
+
+
+# ==============================================================================
+# 4. EXECUÇÃO AGENDADA
+# ==============================================================================
+def conciliar_unidades(client, unidades, freq="M"):
+    """Busca as três abas de todas as unidades em paralelo e executa `conciliar`."""
+    dados, erros = carregar_abas(client, unidades, (ABA_FORMULARIO, ABA_CAIXA, ABA_RETIRADAS))
+    resultado = conciliar(dados[ABA_FORMULARIO], dados[ABA_CAIXA], dados[ABA_RETIRADAS], freq)
+    resultado["erros"] = erros
+    return resultado
+
+
+# A identidade da credencial entra na chave do cache: cada credencial tem a sua
+# tarefa, em vez de todas usarem o cliente de quem chamou primeiro.
+@st.cache_resource
+def _tarefa_conciliacao(_client, identidade, unidades):
+    return TarefaPeriodica(
+        "conciliacao", lambda: conciliar_unidades(_client, unidades), INTERVALO_CONCILIACAO
+    )
+
+
+def get_conciliacao(client, unidades):
+    """
+    Retorna a tarefa agendada de conciliação das unidades. Existe uma única
+    tarefa por credencial e conjunto de unidades, compartilhada por todas as
+    sessões; as páginas apenas leem o último resultado com `tarefa.estado()`.
+    """
+    return _tarefa_conciliacao(client, identidade_client(client), unidades)
@@ -0,0 +1,13 @@
+# ==============================================================================
+# CONSTANTES COMPARTILHADAS DAS PLANILHAS
+# ==============================================================================
+# Nomes de colunas e formatos usados por mais de um módulo. Ficam aqui para que
+# páginas e utilitários não precisem importar uns aos outros só por causa deles.
+
+COLUNA_DATA_FORM = "Carimbo de data/hora"               # Coluna criada automaticamente pelo Google Forms.
+FORMATO_DATA = '%d/%m/%Y %H:%M:%S'                      # Formato de data do formulário, do fluxo de caixa e das retiradas.
+
+# Colunas do formulário com as quantidades pedidas em cada resposta, usadas na
+# previsão de refeições. Ajuste aqui se a planilha da unidade usar outros nomes.
+# As colunas "HJ" não servem: são fórmulas que só contam os pedidos de hoje.
+COLUNAS_REFEICOES = {"Café": "QTD CAFÉ", "Almoço": "QTD ALMOÇO"}
@@ -0,0 +1,194 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict                    # Mantém as entradas na ordem de uso (LRU).
+
+import streamlit as st                                  # Usado para ter um único cache por processo (@st.cache_resource).
+import pandas as pd
+from utils.g_sheets_connector import abrir_planilha, identidade_client
+
+# ==============================================================================
+# 2. CONFIGURAÇÃO
+# ==============================================================================
+# Orçamento de memória e validade das entradas. Podem ser ajustados pelas
+# variáveis de ambiente RANCHO_CACHE_MB e RANCHO_CACHE_TTL (segundos).
+ORCAMENTO_PADRAO_MB = 256
+TTL_PADRAO = 10                                         # Mesmo tempo de vida dos antigos @st.cache_data(ttl=10).
+
+
+def _tamanho(valor):
+    """Estima quantos bytes `valor` ocupa na memória."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return int(pd.Series(valor.memory_usage(deep=True)).sum())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(_tamanho(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(_tamanho(k) + _tamanho(v) for k, v in valor.items())
+    return sys.getsizeof(valor)
+
+
+def _copiar(valor):
+    """Copia os DataFrames devolvidos, para que as páginas possam alterá-los sem afetar o cache."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return valor.copy()
+    if isinstance(valor, (list, tuple)):
+        return type(valor)(_copiar(v) for v in valor)
+    return valor
+
+
+# ==============================================================================
+# 3. CACHE DE DADOS COM LIMITE DE MEMÓRIA
+# ==============================================================================
+class _Entrada:
+    __slots__ = ("valor", "tamanho", "criado_em", "tags")
+
+    def __init__(self, valor, tamanho, tags):
+        self.valor = valor
+        self.tamanho = tamanho
+        self.criado_em = time.monotonic()
+        self.tags = tags
+
+
+class DatasetCache:
+    """
+    Cache LRU de dados das planilhas, limitado por um orçamento em bytes.
+
+    As chaves identificam a credencial, a planilha, a aba e o intervalo lidos,
+    então várias planilhas e contas de serviço podem dividir o mesmo processo
+    sem que uma receba os dados da outra. Quando o total passa do orçamento,
+    as entradas usadas há mais tempo são descartadas.
+
+    Args:
+        orcamento_bytes (int): Memória máxima ocupada pelas entradas.
+        ttl (float): Segundos até uma entrada ser considerada vencida.
+    """
+
+    def __init__(self, orcamento_bytes, ttl=TTL_PADRAO):
+        self.orcamento_bytes = orcamento_bytes
+        self.ttl = ttl
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._carregando = {}                           # Um lock por chave evita buscas duplicadas simultâneas.
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    def _buscar(self, chave):
+        """Retorna a entrada válida de `chave` (marcando-a como usada) ou None. Exige o lock."""
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            return None
+        if time.monotonic() - entrada.criado_em > self.ttl:
+            self._remover(chave)
+            return None
+        self._entradas.move_to_end(chave)
+        return entrada
+
+    def _remover(self, chave):
+        entrada = self._entradas.pop(chave)
+        self._bytes -= entrada.tamanho
+
+    def _guardar(self, chave, valor, tags):
+        tamanho = _tamanho(valor)
+        if tamanho > self.orcamento_bytes:
+            return                                      # Maior que o orçamento inteiro: usa, mas não guarda.
+        if chave in self._entradas:
+            self._remover(chave)
+        self._entradas[chave] = _Entrada(valor, tamanho, frozenset(tags))
+        self._bytes += tamanho
+        while self._bytes > self.orcamento_bytes:
+            self._remover(next(iter(self._entradas)))
+            self.descartes += 1
+
+    def obter(self, chave, carregar, tags=()):
+        """
+        Retorna o valor de `chave`, chamando `carregar()` apenas se ele não
+        estiver no cache (ou estiver vencido). Exceções de `carregar` são
+        propagadas e nada é guardado.
+
+        Args:
+            chave (tuple): Identificação completa do dado.
+            carregar (callable): Função sem argumentos que busca o dado.
+            tags (iterable): Rótulos usados por `invalidar()` (ex.: a chave da planilha).
+        """
+        with self._lock:
+            entrada = self._buscar(chave)
+            if entrada is not None:
+                self.acertos += 1
+                return _copiar(entrada.valor)
+            trava = self._carregando.setdefault(chave, threading.Lock())
+
+        with trava:
+            # Outra sessão pode ter carregado o mesmo dado enquanto esperávamos.
+            with self._lock:
+                entrada = self._buscar(chave)
+                if entrada is not None:
+                    self.acertos += 1
+                    return _copiar(entrada.valor)
+                self.faltas += 1
+            try:
+                valor = carregar()
+                with self._lock:
+                    self._guardar(chave, valor, tags)
+            finally:
+                with self._lock:
+                    self._carregando.pop(chave, None)
+        return _copiar(valor)
+
+    def invalidar(self, tag):
+        """Remove todas as entradas marcadas com `tag` (ex.: após gravar na planilha)."""
+        with self._lock:
+            for chave in [c for c, e in self._entradas.items() if tag in e.tags]:
+                self._remover(chave)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        """Retorna um dicionário com entradas, bytes ocupados, acertos, faltas e descartes."""
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "orcamento_bytes": self.orcamento_bytes,
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "descartes": self.descartes,
+            }
+
+
+@st.cache_resource
+def get_dataset_cache():
+    """Retorna o cache de dados do processo, compartilhado por todas as sessões."""
+    orcamento_mb = float(os.environ.get("RANCHO_CACHE_MB", ORCAMENTO_PADRAO_MB))
+    ttl = float(os.environ.get("RANCHO_CACHE_TTL", TTL_PADRAO))
+    return DatasetCache(int(orcamento_mb * 1024 * 1024), ttl)
+
+
+# ==============================================================================
+# 4. LEITURA DAS PLANILHAS ATRAVÉS DO CACHE
+# ==============================================================================
+def ler_aba(client, chave, aba):
+    """
+    Retorna todos os registros da aba `aba` da planilha `chave` como DataFrame.
+    Pode lançar `gspread.exceptions.WorksheetNotFound`, como a leitura direta.
+    """
+    def carregar():
+        return pd.DataFrame(abrir_planilha(client, chave).worksheet(aba).get_all_records())
+
+    return get_dataset_cache().obter((identidade_client(client), chave, aba, None), carregar, tags=(chave,))
+
+
+def ler_celula(client, chave, aba, celula):
+    """Retorna o valor de uma única célula (ex.: 'J1') da aba `aba`."""
+    def carregar():
+        return abrir_planilha(client, chave).worksheet(aba).acell(celula).value
+
+    return get_dataset_cache().obter((identidade_client(client), chave, aba, celula), carregar, tags=(chave,))
@@ -0,0 +1,276 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import os                                               # Usado para ler a latência simulada das variáveis de ambiente.
+import random                                           # Usado para gerar dados sintéticos reprodutíveis.
+import re                                               # Usado para interpretar endereços de célula no formato A1.
+import threading                                        # Usado para proteger os contadores quando várias sessões rodam em paralelo.
+import time                                             # Usado para simular a latência da API e registrar o horário das chamadas.
+from collections import Counter
+from datetime import datetime, timedelta
+
+import gspread                                          # Apenas para reutilizar as mesmas exceções da biblioteca real.
+
+# ==============================================================================
+# 2. BACKEND FALSO DO GOOGLE SHEETS
+# ==============================================================================
+# Estas classes imitam a pequena parte da API do gspread usada pelas páginas
+# (open, worksheet, get_all_records, acell, row_values, update_cells, append_row...).
+# Elas guardam tudo em memória e contam cada chamada, o que permite rodar o app
+# e o teste de carga sem credenciais e sem consumir a cota real do Google.
+
+
+def _coluna_para_indice(letras):
+    """Converte letras de coluna ('A', 'J', 'AA') para índice começando em 1."""
+    indice = 0
+    for letra in letras.upper():
+        indice = indice * 26 + (ord(letra) - ord("A") + 1)
+    return indice
+
+
+class FakeCell:
+    """Célula simplificada, com os mesmos atributos usados de `gspread.Cell`."""
+
+    def __init__(self, row, col, value):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+class FakeWorksheet:
+    """Aba em memória. A primeira linha da grade é o cabeçalho."""
+
+    def __init__(self, spreadsheet, title, rows):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self._linhas = [list(linha) for linha in rows]
+
+    def _registrar(self, metodo):
+        self.spreadsheet.client._registrar(metodo)
+
+    def get_all_records(self):
+        self._registrar("get_all_records")
+        if not self._linhas:
+            return []
+        cabecalho = self._linhas[0]
+        # Colunas sem título (como a J1 usada para o total na aba de caixa) são ignoradas.
+        colunas = [(i, nome) for i, nome in enumerate(cabecalho) if nome != ""]
+        registros = []
+        for linha in self._linhas[1:]:
+            registros.append({nome: (linha[i] if i < len(linha) else "") for i, nome in colunas})
+        return registros
+
+    def get_all_values(self):
+        self._registrar("get_all_values")
+        return [[str(valor) for valor in linha] for linha in self._linhas]
+
+    def row_values(self, row):
+        self._registrar("row_values")
+        if row - 1 < len(self._linhas):
+            return [str(valor) for valor in self._linhas[row - 1]]
+        return []
+
+    def acell(self, label):
+        self._registrar("acell")
+        correspondencia = re.fullmatch(r"([A-Za-z]+)(\d+)", label)
+        col = _coluna_para_indice(correspondencia.group(1))
+        row = int(correspondencia.group(2))
+        valor = None
+        if row - 1 < len(self._linhas) and col - 1 < len(self._linhas[row - 1]):
+            valor = self._linhas[row - 1][col - 1]
+        return FakeCell(row, col, valor if valor != "" else None)
+
+    def _escrever(self, row, col, value):
+        while len(self._linhas) < row:
+            self._linhas.append([])
+        linha = self._linhas[row - 1]
+        while len(linha) < col:
+            linha.append("")
+        linha[col - 1] = value
+
+    def update_cells(self, cell_list, value_input_option="RAW"):
+        self._registrar("update_cells")
+        for celula in cell_list:
+            self._escrever(celula.row, celula.col, celula.value)
+
+    def batch_update(self, data, value_input_option="RAW"):
+        self._registrar("batch_update")
+        for bloco in data:
+            inicio = re.match(r"([A-Za-z]+)(\d+)", bloco["range"])
+            col, row = _coluna_para_indice(inicio.group(1)), int(inicio.group(2))
+            for i, linha in enumerate(bloco["values"]):
+                for j, valor in enumerate(linha):
+                    self._escrever(row + i, col + j, valor)
+
+    def append_row(self, values, value_input_option="RAW"):
+        self._registrar("append_row")
+        self._linhas.append(list(values))
+
+    def append_rows(self, values, value_input_option="RAW"):
+        self._registrar("append_rows")
+        self._linhas.extend(list(linha) for linha in values)
+
+
+class FakeSpreadsheet:
+    """Planilha em memória com um dicionário de abas."""
+
+    def __init__(self, client, title, abas):
+        self.client = client
+        self.title = title
+        self.id = title
+        self._abas = {nome: FakeWorksheet(self, nome, linhas) for nome, linhas in abas.items()}
+
+    def worksheet(self, title):
+        self.client._registrar("worksheet")
+        if title not in self._abas:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self._abas[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self.client._registrar("add_worksheet")
+        self._abas[title] = FakeWorksheet(self, title, [])
+        return self._abas[title]
+
+
+class FakeClient:
+    """
+    Cliente falso compatível com o `gspread.Client` usado nas páginas.
+
+    Args:
+        planilhas (dict): Mapeia o título da planilha para um dicionário {aba: linhas}.
+        latencia (float): Segundos de espera simulados em cada chamada à "API".
+    """
+
+    def __init__(self, planilhas, latencia=0.0):
+        self.latencia = latencia
+        self._lock = threading.Lock()
+        self._chamadas = []                             # Lista de (horário, método) de cada chamada feita.
+        self._planilhas = {
+            titulo: FakeSpreadsheet(self, titulo, abas) for titulo, abas in planilhas.items()
+        }
+
+    def _registrar(self, metodo):
+        with self._lock:
+            self._chamadas.append((time.monotonic(), metodo))
+        if self.latencia:
+            time.sleep(self.latencia)
+
+    def open(self, title):
+        self._registrar("open")
+        if title not in self._planilhas:
+            raise gspread.exceptions.SpreadsheetNotFound(title)
+        return self._planilhas[title]
+
+    def open_by_key(self, key):
+        # No backend falso a chave e o título são a mesma coisa.
+        return self.open(key)
+
+    def titulos(self):
+        """Retorna os títulos das planilhas disponíveis no backend falso."""
+        return list(self._planilhas)
+
+    def total_chamadas(self):
+        """Retorna o número total de chamadas feitas à API falsa."""
+        with self._lock:
+            return len(self._chamadas)
+
+    def chamadas_por_metodo(self):
+        """Retorna um `Counter` com o número de chamadas por método."""
+        with self._lock:
+            return Counter(metodo for _, metodo in self._chamadas)
+
+    def zerar_contadores(self):
+        with self._lock:
+            self._chamadas.clear()
+
+
+# ==============================================================================
+# 3. GERAÇÃO DE DADOS SINTÉTICOS
+# ==============================================================================
+GRADUACOES = ["Sd PM", "Cb PM", "3º Sgt PM", "2º Sgt PM", "1º Sgt PM", "Subten PM", "Ten PM", "Cap PM"]
+
+
+def gerar_planilha_exemplo(n_pessoas=150, n_dias=120, seed=32):
+    """
+    Gera as abas da planilha 'Previsao_de_Rancho' com dados sintéticos.
+
+    Returns:
+        dict: {nome_da_aba: linhas}, no formato esperado por `FakeClient`.
+    """
+    aleatorio = random.Random(seed)
+    hoje = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    pessoas = [
+        (str(100000 + i), aleatorio.choice(GRADUACOES), f"Guerra{i}") for i in range(n_pessoas)
+    ]
+
+    formulario = [[
+        "Carimbo de data/hora", "RE (Sem dígito):", "Graduação:", "Nome de Guerra:",
+        "QTD CAFÉ", "QTD ALMOÇO", "QTD CAFÉ HJ", "QTD ALMOÇO HJ", "TOTAL", "Quitado",
+    ]]
+    caixa = [["REGISTRO", "LANÇAMENTOS", "DESCRIÇÃO"]]
+    retiradas = [["Data/Hora", "Motivo", "Local", "Produto/Descrição", "Valor"]]
+    saldo = 0.0
+
+    for d in range(n_dias, -1, -1):
+        dia = hoje - timedelta(days=d)
+        # Fins de semana têm bem menos gente no quartel.
+        presenca = 0.15 if dia.weekday() >= 5 else 0.6
+        for re_, graduacao, nome in pessoas:
+            if aleatorio.random() > presenca:
+                continue
+            cafe = aleatorio.choice([0, 1, 1])
+            almoco = aleatorio.choice([0, 1, 1, 1])
+            if cafe == 0 and almoco == 0:
+                continue
+            total = round(cafe * 3.0 + almoco * 12.0, 2)
+            # Registros antigos tendem a estar quitados; os recentes, pendentes.
+            quitado = "Sim" if aleatorio.random() < min(0.95, d / 30) else "Não"
+            horario = dia + timedelta(hours=6, minutes=aleatorio.randint(0, 240))
+            formulario.append([
+                horario.strftime("%d/%m/%Y %H:%M:%S"), re_, graduacao, nome, cafe, almoco,
+                # As colunas "HJ" da planilha real são fórmulas que só contam os pedidos de hoje.
+                cafe if d == 0 else 0, almoco if d == 0 else 0, total, quitado,
+            ])
+            if quitado == "Sim":
+                pagamento = horario + timedelta(days=aleatorio.randint(0, 3), hours=4)
+                caixa.append([pagamento.strftime("%d/%m/%Y %H:%M:%S"), total, f"Quitação RE {re_}"])
+                saldo += total
+        if d % 7 == 3:
+            valor = -round(aleatorio.uniform(80, 600), 2)
+            registro = (dia + timedelta(hours=15)).strftime("%d/%m/%Y %H:%M:%S")
+            retiradas.append([registro, "Compra de gêneros", "Mercado", "Diversos", valor])
+            caixa.append([registro, valor, "Retirada"])
+            saldo += valor
+
+    # A célula J1 da aba de caixa guarda o total arrecadado já formatado.
+    caixa[1:] = sorted(caixa[1:], key=lambda linha: datetime.strptime(linha[0], "%d/%m/%Y %H:%M:%S"))
+    caixa[0] += [""] * 6 + [f"R$ {saldo:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")]
+
+    return {
+        "Respostas_ao_formulario_1": formulario,
+        "FLUXO DE CAIXA": caixa,
+        "RETIRADAS": retiradas,
+    }
+
+
+_client_lock = threading.Lock()
+_client_compartilhado = None
+
+
+def get_fake_client():
+    """
+    Retorna um `FakeClient` único por processo com a planilha 'Previsao_de_Rancho'.
+    A latência simulada pode ser ajustada pela variável RANCHO_FAKE_LATENCIA (segundos)
+    e o número de unidades (planilhas) pela variável RANCHO_FAKE_UNIDADES.
+    """
+    global _client_compartilhado
+
+    with _client_lock:
+        if _client_compartilhado is None:
+            latencia = float(os.environ.get("RANCHO_FAKE_LATENCIA", "0"))
+            n_unidades = int(os.environ.get("RANCHO_FAKE_UNIDADES", "1"))
+            planilhas = {"Previsao_de_Rancho": gerar_planilha_exemplo()}
+            for i in range(2, n_unidades + 1):
+                planilhas[f"Previsao_de_Rancho_{i}"] = gerar_planilha_exemplo(seed=32 + i)
+            _client_compartilhado = FakeClient(planilhas, latencia=latencia)
+        return _client_compartilhado
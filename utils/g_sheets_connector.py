@@ -30,8 +30,14 @@ def get_gspread_client():
         # LÓGICA DE AUTENTICAÇÃO HÍBRIDA (LOCAL vs. PRODUÇÃO)
         # --------------------------------------------------------------------------
 
+        # 0. Modo de demonstração/teste de carga: usa o backend falso em memória.
+        #    Ativado com a variável de ambiente RANCHO_FAKE_SHEETS=1.
+        if os.environ.get("RANCHO_FAKE_SHEETS") == "1":
+            from utils.fake_sheets import get_fake_client
+            client = get_fake_client()
+
         # 1. Prioriza o arquivo local para desenvolvimento.
-        if os.path.exists(creds_path):
+        elif os.path.exists(creds_path):
             client = gspread.service_account(filename=creds_path)
             # st.info("Conectado via credentials.json (Local).") # Descomente para depuração.
         
@@ -53,3 +59,111 @@ def get_gspread_client():
     except ImportError as e:
         st.error(f"Erro ao autenticar com o Google Sheets: {e}")
         return None # Retorna None em caso de erro.
+
+
+# ==============================================================================
+# 3. CONFIGURAÇÃO DAS UNIDADES (PLANILHAS)
+# ==============================================================================
+# Planilha usada quando nenhuma unidade é configurada. Ela é aberta pelo título,
+# como sempre foi feito; as demais unidades são abertas pela chave da planilha.
+PLANILHA_PADRAO = "Previsao_de_Rancho"
+
+
+def get_unidades():
+    """
+    Retorna a lista de unidades (ranchos) configuradas, como uma tupla de
+    pares (nome, chave). Uma chave `None` indica a planilha padrão.
+
+    As unidades são lidas dos 'secrets' do Streamlit, no formato:
+
+        [[unidades]]
+        nome = "1ª Cia"
+        chave = "1AbC...xyz"   # Chave da planilha (trecho da URL após /d/)
+    """
+    # No modo de demonstração, cada planilha do backend falso é uma unidade.
+    if os.environ.get("RANCHO_FAKE_SHEETS") == "1":
+        from utils.fake_sheets import get_fake_client
+        return tuple((titulo, titulo) for titulo in get_fake_client().titulos())
+
+    padrao = (("Rancho", None),)
+
+    # Sem secrets.toml (o caso normal no desenvolvimento local com credentials.json)
+    # não há unidades configuradas; isso não é um erro e não gera aviso.
+    try:
+        if not st.secrets.load_if_toml_exists() or "unidades" not in st.secrets:
+            return padrao
+    except FileNotFoundError:
+        return padrao
+
+    try:
+        unidades = tuple((str(u["nome"]), str(u["chave"])) for u in st.secrets["unidades"])
+    except (KeyError, TypeError) as e:
+        st.warning(f"Configuração de unidades inválida, usando a planilha padrão: {e}")
+        return padrao
+    return unidades or padrao
+
+
+def abrir_planilha(client, chave=None):
+    """Abre a planilha de uma unidade pela chave ou, se `chave` for None, a planilha padrão pelo título."""
+    if chave is None:
+        return client.open(PLANILHA_PADRAO)
+    return client.open_by_key(chave)
+
+
+# O objeto da aba é guardado com `@st.cache_resource`, evitando um `open` e um
+# `worksheet` a cada gravação. A identidade da credencial, a chave da planilha e
+# o nome da aba entram na chave do cache, então cada unidade tem suas próprias abas.
+@st.cache_resource
+def _abrir_aba(_client, identidade, chave, aba, cabecalho):
+    spreadsheet = abrir_planilha(_client, chave)
+    try:
+        return spreadsheet.worksheet(aba)
+    except gspread.exceptions.WorksheetNotFound:
+        if cabecalho is None:
+            raise
+        worksheet = spreadsheet.add_worksheet(title=aba, rows="100", cols="10")
+        worksheet.append_row(list(cabecalho), value_input_option='USER_ENTERED')
+        return worksheet
+
+
+def get_worksheet(client, chave, aba, cabecalho=None):
+    """
+    Retorna a aba `aba` da planilha `chave`, reaproveitando o objeto entre reruns.
+
+    Args:
+        cabecalho (tuple): Se informado, a aba é criada com este cabeçalho quando
+            não existir. Sem ele, a ausência da aba gera `WorksheetNotFound`.
+    """
+    return _abrir_aba(client, identidade_client(client), chave, aba, cabecalho)
+
+
+def esquecer_worksheets():
+    """
+    Descarta as abas guardadas por `get_worksheet`. Deve ser chamada após um
+    erro da API, pois a aba pode ter sido apagada ou renomeada na planilha.
+    """
+    _abrir_aba.clear()
+
+
+def get_unidade_ativa():
+    """
+    Retorna o par (nome, chave) da unidade selecionada na barra lateral.
+    Se nenhuma unidade foi selecionada ainda, usa a primeira configurada.
+    """
+    unidades = get_unidades()
+    nome = st.session_state.get("unidade_ativa")
+    for unidade in unidades:
+        if unidade[0] == nome:
+            return unidade
+    return unidades[0]
+
+
+def identidade_client(client):
+    """
+    Retorna um identificador da credencial usada pelo cliente (o e-mail da conta
+    de serviço), para que dados lidos com credenciais diferentes não se misturem
+    no cache.
+    """
+    credenciais = getattr(getattr(client, "http_client", None), "auth", None)
+    email = getattr(credenciais, "service_account_email", None)
+    return email or f"{type(client).__name__}-{id(client)}"
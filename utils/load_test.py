@@ -0,0 +1,241 @@
+# ==============================================================================
+# TESTE DE CARGA COM VÁRIAS SESSÕES SIMULTÂNEAS
+# ==============================================================================
+# Simula N usuários (furriéis, caixas, visualizadores) navegando pelas
+# páginas registradas em `index.py`, todas rodando no mesmo processo do Streamlit
+# e compartilhando os mesmos caches, como acontece em produção.
+#
+# Cada sessão é um conjunto de `AppTest` (um por página) executado em sua própria
+# thread. O app é ligado ao backend falso (utils/fake_sheets.py), então nenhuma
+# cota do Google é consumida e as chamadas à "API" podem ser contadas.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m utils.load_test --sessoes 20 --rodadas 5 --latencia 0.15
+#     python -m utils.load_test --sessoes 20 --sem-cache   # compara com cache frio
+# ==============================================================================
+import argparse
+import ast
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+
+def _paginas_do_index():
+    """
+    Lê as páginas registradas em `st.navigation` no index.py, sem executá-lo.
+
+    Returns:
+        dict: {título: caminho do arquivo}, na ordem do menu.
+    """
+    with open(os.path.join(PROJECT_ROOT, "index.py"), encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read())
+    paginas = {}
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.Call) and getattr(no.func, "attr", None) == "Page" and no.args:
+            caminho = ast.literal_eval(no.args[0])
+            titulos = [ast.literal_eval(k.value) for k in no.keywords if k.arg == "title"]
+            paginas[titulos[0] if titulos else caminho] = caminho
+    return paginas
+
+
+# As mesmas páginas do menu, na ordem em que aparecem no index.py.
+PAGINAS = _paginas_do_index()
+
+
+@dataclass
+class ResultadoSessao:
+    """Latências (em segundos) de cada rerun de uma sessão, agrupadas por página."""
+    latencias: dict = field(default_factory=dict)
+    erros: list = field(default_factory=list)
+    apps: list = field(default_factory=list)            # Mantém os AppTest vivos para medir a memória.
+
+
+def _percentil(valores, p):
+    """Percentil pelo método do posto mais próximo (não exige numpy)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[posicao]
+
+
+def _interagir(nome_pagina, app, numero_sessao):
+    """Executa a interação típica de cada página antes do rerun."""
+    if nome_pagina == "Valores por Pessoa" and app.text_input:
+        # Cada sessão busca um RE diferente, como vários caixas atendendo ao mesmo tempo.
+        app.text_input(key="busca_re_input").input(str(100000 + numero_sessao % 150))
+        app.button(key="buscar_btn").click()
+
+
+def _executar_sessao(numero_sessao, rodadas, intervalo, sem_cache):
+    from streamlit.testing.v1 import AppTest
+    from utils.dataset_cache import get_dataset_cache
+
+    resultado = ResultadoSessao()
+    apps = {
+        nome: AppTest.from_file(os.path.join(PROJECT_ROOT, caminho), default_timeout=60)
+        for nome, caminho in PAGINAS.items()
+    }
+    for rodada in range(rodadas):
+        for nome, app in apps.items():
+            if sem_cache:
+                get_dataset_cache().limpar()
+            if rodada > 0:
+                _interagir(nome, app, numero_sessao)
+            inicio = time.perf_counter()
+            try:
+                app.run()
+            except Exception as e:
+                resultado.erros.append(f"{nome}: {e}")
+                continue
+            resultado.latencias.setdefault(nome, []).append(time.perf_counter() - inicio)
+            if app.exception:
+                resultado.erros.append(f"{nome}: {app.exception[0].message}")
+            if intervalo:
+                time.sleep(intervalo)
+    resultado.apps = list(apps.values())
+    return resultado
+
+
+def executar(sessoes, rodadas, intervalo=0.0, sem_cache=False, medir_memoria=False):
+    """
+    Roda o teste de carga e retorna um dicionário com as métricas coletadas.
+
+    Args:
+        sessoes (int): Número de sessões simultâneas.
+        rodadas (int): Quantas vezes cada sessão percorre todas as páginas.
+        intervalo (float): Tempo de "leitura" do usuário entre dois reruns, em segundos.
+        sem_cache (bool): Se True, limpa o cache de dados antes de cada rerun.
+        medir_memoria (bool): Se True, usa `tracemalloc` (deixa o teste mais lento).
+            A memória é separada em compartilhada (cache de dados, previsões,
+            conciliação) e por sessão (o que é liberado ao descartar as sessões).
+    """
+    os.environ["RANCHO_FAKE_SHEETS"] = "1"
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from utils.fake_sheets import get_fake_client
+    from utils.dataset_cache import get_dataset_cache
+
+    client = get_fake_client()
+    client.zerar_contadores()
+    cache = get_dataset_cache()
+    cache.limpar()
+    estatisticas_iniciais = cache.estatisticas()
+
+    if medir_memoria:
+        tracemalloc.start()
+        memoria_inicial = tracemalloc.get_traced_memory()[0]
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessoes, thread_name_prefix="sessao") as pool:
+        futuros = [
+            pool.submit(_executar_sessao, i, rodadas, intervalo, sem_cache) for i in range(sessoes)
+        ]
+        resultados = [f.result() for f in futuros]
+    duracao = time.perf_counter() - inicio
+
+    memoria_por_sessao = memoria_compartilhada = None
+    if medir_memoria:
+        gc.collect()
+        memoria_com_sessoes = tracemalloc.get_traced_memory()[0]
+        # Descarta os AppTest: o que sobra depois disso é estado compartilhado
+        # entre as sessões, que não cresce com o número de usuários.
+        for resultado in resultados:
+            resultado.apps.clear()
+        gc.collect()
+        memoria_sem_sessoes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        memoria_por_sessao = (memoria_com_sessoes - memoria_sem_sessoes) / sessoes
+        memoria_compartilhada = memoria_sem_sessoes - memoria_inicial
+
+    por_pagina = {}
+    for resultado in resultados:
+        for nome, valores in resultado.latencias.items():
+            por_pagina.setdefault(nome, []).extend(valores)
+    todas = [v for valores in por_pagina.values() for v in valores]
+    estatisticas = cache.estatisticas()
+
+    return {
+        "sessoes": sessoes,
+        "rodadas": rodadas,
+        "duracao_s": duracao,
+        "reruns": len(todas),
+        "p50_s": _percentil(todas, 50),
+        "p95_s": _percentil(todas, 95),
+        "por_pagina": {
+            nome: {"p50_s": _percentil(v, 50), "p95_s": _percentil(v, 95), "reruns": len(v)}
+            for nome, v in por_pagina.items()
+        },
+        "chamadas_api": client.total_chamadas(),
+        "chamadas_por_minuto": client.total_chamadas() / (duracao / 60) if duracao else 0.0,
+        "chamadas_por_metodo": dict(client.chamadas_por_metodo()),
+        "memoria_por_sessao_bytes": memoria_por_sessao,
+        "memoria_compartilhada_bytes": memoria_compartilhada,
+        "cache": {
+            "acertos": estatisticas["acertos"] - estatisticas_iniciais["acertos"],
+            "faltas": estatisticas["faltas"] - estatisticas_iniciais["faltas"],
+            "descartes": estatisticas["descartes"] - estatisticas_iniciais["descartes"],
+            "bytes": estatisticas["bytes"],
+            "orcamento_bytes": estatisticas["orcamento_bytes"],
+        },
+        "erros": [erro for resultado in resultados for erro in resultado.erros],
+    }
+
+
+def _imprimir_relatorio(metricas):
+    print(f"Sessões: {metricas['sessoes']} | Rodadas: {metricas['rodadas']} | "
+          f"Reruns: {metricas['reruns']} | Duração: {metricas['duracao_s']:.1f}s")
+    print(f"Latência do rerun: p50 = {metricas['p50_s'] * 1000:.0f} ms | "
+          f"p95 = {metricas['p95_s'] * 1000:.0f} ms")
+    for nome, valores in metricas["por_pagina"].items():
+        print(f"  {nome:<20} p50 = {valores['p50_s'] * 1000:7.0f} ms | "
+              f"p95 = {valores['p95_s'] * 1000:7.0f} ms | reruns = {valores['reruns']}")
+    print(f"Chamadas à API: {metricas['chamadas_api']} "
+          f"({metricas['chamadas_por_minuto']:.0f} por minuto)")
+    for metodo, quantidade in sorted(metricas["chamadas_por_metodo"].items()):
+        print(f"  {metodo:<20} {quantidade}")
+    cache = metricas["cache"]
+    print(f"Cache de dados: {cache['acertos']} acertos | {cache['faltas']} faltas | "
+          f"{cache['descartes']} descartes | {cache['bytes'] / 1024:.0f} de "
+          f"{cache['orcamento_bytes'] / 1024:.0f} KiB")
+    if metricas["memoria_por_sessao_bytes"] is not None:
+        print(f"Memória por sessão: {metricas['memoria_por_sessao_bytes'] / 1024:.0f} KiB | "
+              f"compartilhada: {metricas['memoria_compartilhada_bytes'] / 1024:.0f} KiB "
+              f"(cache de dados: {cache['bytes'] / 1024:.0f} KiB)")
+    if metricas["erros"]:
+        print(f"Erros ({len(metricas['erros'])}):")
+        for erro in metricas["erros"][:10]:
+            print(f"  {erro}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard Previsão de Rancho.")
+    parser.add_argument("--sessoes", type=int, default=10, help="Sessões simultâneas.")
+    parser.add_argument("--rodadas", type=int, default=3, help="Passagens por todas as páginas em cada sessão.")
+    parser.add_argument("--intervalo", type=float, default=0.0, help="Pausa entre reruns, em segundos.")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência simulada de cada chamada à API, em segundos.")
+    parser.add_argument("--unidades", type=int, default=1, help="Número de unidades (planilhas) no backend falso.")
+    parser.add_argument("--cache-mb", type=float, default=None, help="Orçamento de memória do cache de dados, em MB.")
+    parser.add_argument("--sem-cache", action="store_true", help="Limpa o cache de dados antes de cada rerun.")
+    parser.add_argument("--memoria", action="store_true", help="Mede a memória por sessão com tracemalloc.")
+    args = parser.parse_args(argv)
+
+    # Estas variáveis precisam estar definidas antes do cliente falso e do cache serem criados.
+    os.environ["RANCHO_FAKE_LATENCIA"] = str(args.latencia)
+    os.environ["RANCHO_FAKE_UNIDADES"] = str(args.unidades)
+    if args.cache_mb is not None:
+        os.environ["RANCHO_CACHE_MB"] = str(args.cache_mb)
+    metricas = executar(args.sessoes, args.rodadas, args.intervalo, args.sem_cache, args.memoria)
+    _imprimir_relatorio(metricas)
+    return 1 if metricas["erros"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import threading
+
+import streamlit as st                                  # Usado para manter um previsor por unidade (@st.cache_resource).
+import pandas as pd
+from utils.agendador import TarefaPeriodica
+from utils.constantes import COLUNA_DATA_FORM, COLUNAS_REFEICOES, FORMATO_DATA
+
+# ==============================================================================
+# 2. CONFIGURAÇÃO DO MODELO
+# ==============================================================================
+# O modelo é uma média sazonal por dia da semana com suavização exponencial:
+# para cada dia da semana (segunda, terça...), a previsão é a média móvel
+# exponencial das quantidades pedidas naquele mesmo dia nas semanas anteriores.
+# As semanas mais recentes pesam mais, de acordo com ALFA.
+ALFA = 0.35                                             # Peso da observação mais recente (0 a 1).
+SEMANAS_HISTORICO = 12                                  # Quantas semanas de histórico entram no ajuste.
+HORIZONTE = 7                                           # Quantos dias à frente são previstos, contando hoje.
+
+
+def ajustar_previsao(df_form, dias=HORIZONTE, hoje=None):
+    """
+    Monta as séries diárias de café e almoço a partir do histórico do formulário
+    e prevê as quantidades dos próximos `dias`.
+
+    Returns:
+        pd.DataFrame: Indexado pela data, com as colunas 'Café' e 'Almoço'
+        (inteiros). Vazio se não houver histórico com data válida.
+
+    Raises:
+        ValueError: Se faltar na planilha a coluna de data ou alguma das colunas
+        de `COLUNAS_REFEICOES`. A mensagem cita as colunas ausentes.
+    """
+    hoje = (hoje or pd.Timestamp.today()).normalize()
+    ausentes = [col for col in [COLUNA_DATA_FORM, *COLUNAS_REFEICOES.values()] if col not in df_form.columns]
+    if ausentes:
+        raise ValueError(f"coluna(s) ausente(s) na planilha: {', '.join(ausentes)}")
+
+    datas = pd.to_datetime(df_form[COLUNA_DATA_FORM], format=FORMATO_DATA, errors='coerce').dt.normalize()
+    quantidades = pd.DataFrame({
+        nome: pd.to_numeric(df_form[col], errors='coerce').fillna(0) for nome, col in COLUNAS_REFEICOES.items()
+    })
+    diario = quantidades.groupby(datas).sum()           # Linhas sem data (NaT) ficam de fora do groupby.
+
+    # O dia de hoje ainda está recebendo pedidos; o ajuste usa só dias completos.
+    inicio = max(diario.index.min(), hoje - pd.Timedelta(weeks=SEMANAS_HISTORICO)) if not diario.empty else hoje
+    historico = pd.date_range(inicio, hoje - pd.Timedelta(days=1), freq="D")
+    if historico.empty:
+        return pd.DataFrame(columns=list(COLUNAS_REFEICOES))
+    # Dias sem nenhuma resposta são dias sem pedidos, e não dados faltantes.
+    diario = diario.reindex(historico, fill_value=0)
+
+    nivel = (
+        diario.groupby(diario.index.dayofweek)
+        .ewm(alpha=ALFA).mean()
+        .groupby(level=0).last()
+    )
+
+    futuro = pd.date_range(hoje, periods=dias, freq="D")
+    previsao = nivel.reindex(futuro.dayofweek).fillna(0).round().astype(int)
+    previsao.index = futuro
+    previsao.index.name = "Data"
+    return previsao
+
+
+# ==============================================================================
+# 3. AJUSTE EM SEGUNDO PLANO
+# ==============================================================================
+def _assinatura(df_form):
+    """
+    Identifica o conteúdo das colunas usadas pelo modelo, sem ajustá-lo. A data
+    de hoje faz parte da assinatura porque a previsão começa hoje e o dia de
+    ontem passa a entrar no histórico mesmo sem respostas novas.
+    """
+    colunas = [c for c in [COLUNA_DATA_FORM, *COLUNAS_REFEICOES.values()] if c in df_form.columns]
+    conteudo = int(pd.util.hash_pandas_object(df_form[colunas], index=False).sum()) if colunas else 0
+    return pd.Timestamp.today().date(), len(df_form), tuple(colunas), conteudo
+
+
+class Previsor:
+    """
+    Guarda a última previsão de uma unidade e a reajusta em segundo plano
+    sempre que o snapshot do formulário muda. A página chama `atualizar()` a
+    cada rerun (custa só uma assinatura do DataFrame) e lê o resultado com
+    `estado()`, sem nunca esperar pelo ajuste do modelo.
+
+    O ajuste roda em uma `TarefaPeriodica` sem intervalo, acordada apenas
+    quando chega um snapshot novo.
+    """
+
+    def __init__(self, nome):
+        self._lock = threading.Lock()
+        self._assinatura_atual = None
+        self._snapshot = None
+        self._tarefa = TarefaPeriodica(
+            f"previsao-{nome}", self._ajustar, intervalo=None, executar_ao_iniciar=False
+        )
+
+    def atualizar(self, df_form):
+        """Agenda um novo ajuste se `df_form` mudou desde o último snapshot recebido."""
+        assinatura = _assinatura(df_form)
+        with self._lock:
+            if assinatura == self._assinatura_atual:
+                return
+            self._assinatura_atual = assinatura
+            self._snapshot = df_form.copy()
+        self._tarefa.executar_agora()
+
+    def _ajustar(self):
+        # Sempre ajusta o snapshot mais recente; os que chegaram durante um ajuste
+        # são substituídos e resultam em uma única nova execução.
+        with self._lock:
+            df_form = self._snapshot
+        return ajustar_previsao(df_form)
+
+    def estado(self):
+        """Retorna (previsao, atualizado_em, erro) de forma consistente entre threads."""
+        return self._tarefa.estado()
+
+
+@st.cache_resource
+def get_previsor(chave):
+    """Retorna o previsor da unidade `chave`, compartilhado por todas as sessões."""
+    return Previsor(chave or "padrao")
@@ -0,0 +1,139 @@
+# ==============================================================================
+# 1. IMPORTAÇÃO DAS BIBLIOTECAS
+# ==============================================================================
+import pandas as pd                                     # Usado para concatenar e agrupar os dados das unidades.
+import gspread
+from concurrent.futures import ThreadPoolExecutor       # Pool de threads para buscar as planilhas em paralelo.
+from utils.g_sheets_connector import identidade_client
+from utils.constantes import FORMATO_DATA
+from utils.dataset_cache import get_dataset_cache, ler_aba
+
+# Número máximo de planilhas buscadas ao mesmo tempo. Mantém o uso da cota da
+# API do Google sob controle mesmo com muitas unidades configuradas.
+MAX_WORKERS = 8
+
+# ==============================================================================
+# 2. CARREGAMENTO DAS ABAS DE TODAS AS UNIDADES
+# ==============================================================================
+def _carregar_unidade(client, nome, chave, abas):
+    """
+    Busca as abas pedidas de uma unidade. Retorna ({aba: df}, erro). Em caso de
+    falha os DataFrames vêm vazios e `erro` descreve o problema, para que as
+    outras unidades não sejam afetadas.
+    """
+    dados, faltando = {}, []
+    try:
+        for aba in abas:
+            try:
+                dados[aba] = ler_aba(client, chave, aba)
+            except gspread.exceptions.WorksheetNotFound:
+                # Uma aba ausente (ex.: 'RETIRADAS' ainda não criada) não invalida as demais.
+                dados[aba] = pd.DataFrame()
+                faltando.append(aba)
+    except Exception as e:
+        return {aba: pd.DataFrame() for aba in abas}, f"{nome}: {e}"
+
+    for df in dados.values():
+        df["Unidade"] = nome
+    erro = f"{nome}: aba(s) não encontrada(s): {', '.join(faltando)}" if faltando else None
+    return dados, erro
+
+
+def carregar_abas(client, unidades, abas):
+    """
+    Carrega as mesmas abas de todas as unidades em paralelo.
+
+    Args:
+        client: Cliente do gspread.
+        unidades (tuple): Pares (nome, chave) retornados por `get_unidades()`.
+        abas (tuple): Nomes das abas a buscar em cada planilha.
+
+    Returns:
+        tuple: ({aba: df}, erros). Cada DataFrame junta todas as unidades e
+        traz a coluna 'Unidade'; `erros` lista as unidades que falharam.
+    """
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(unidades))) as pool:
+        resultados = list(pool.map(lambda u: _carregar_unidade(client, u[0], u[1], abas), unidades))
+
+    erros = [erro for _, erro in resultados if erro]
+    dados = {}
+    for aba in abas:
+        # Uma única concatenação por aba, em vez de juntar as unidades uma a uma.
+        df = pd.concat([r[0][aba] for r in resultados], ignore_index=True)
+        if "Unidade" not in df.columns:
+            df["Unidade"] = pd.Series(dtype=str)
+        dados[aba] = df
+    return dados, erros
+
+
+# ==============================================================================
+# 3. CARREGAMENTO E CONSOLIDAÇÃO DE TODAS AS UNIDADES
+# ==============================================================================
+def _preparar_formulario(df_form):
+    """Converte as colunas usadas nos totais, de uma vez para todas as unidades."""
+    for col in ["QTD CAFÉ HJ", "QTD ALMOÇO HJ", "TOTAL"]:
+        if col not in df_form.columns:
+            df_form[col] = 0
+        df_form[col] = pd.to_numeric(df_form[col], errors='coerce').fillna(0)
+    if "Quitado" not in df_form.columns:
+        df_form["Quitado"] = ""
+    df_form["Quitado"] = df_form["Quitado"].astype(str)
+    return df_form
+
+
+def _preparar_caixa(df_caixa):
+    # Como na página de Fluxo de Caixa, lançamentos sem data válida em REGISTRO
+    # ficam de fora do saldo, para que as duas páginas mostrem o mesmo valor.
+    if "REGISTRO" not in df_caixa.columns:
+        df_caixa["REGISTRO"] = pd.Series(dtype=str)
+    datas = pd.to_datetime(df_caixa["REGISTRO"], format=FORMATO_DATA, errors='coerce')
+    df_caixa = df_caixa[datas.notna()].copy()
+    if "LANÇAMENTOS" not in df_caixa.columns:
+        df_caixa["LANÇAMENTOS"] = 0
+    df_caixa["LANÇAMENTOS"] = pd.to_numeric(df_caixa["LANÇAMENTOS"], errors='coerce').fillna(0)
+    return df_caixa
+
+
+def resumir_unidades(df_form, df_caixa, nomes):
+    """
+    Calcula, por unidade, os totais de café, almoço, valor pendente e saldo do caixa.
+
+    Returns:
+        pd.DataFrame: Indexado pelo nome da unidade, na ordem de `nomes`.
+    """
+    pendente = df_form["TOTAL"].where(df_form["Quitado"] != "Sim", 0)
+    resumo_form = (
+        df_form.assign(Pendente=pendente)
+        .groupby("Unidade")[["QTD CAFÉ HJ", "QTD ALMOÇO HJ", "Pendente"]]
+        .sum()
+        .rename(columns={"QTD CAFÉ HJ": "Café", "QTD ALMOÇO HJ": "Almoço"})
+    )
+    saldo = df_caixa.groupby("Unidade")["LANÇAMENTOS"].sum().rename("Saldo")
+    resumo = pd.concat([resumo_form, saldo], axis=1).reindex(list(nomes)).fillna(0)
+    resumo[["Café", "Almoço"]] = resumo[["Café", "Almoço"]].astype(int)
+    resumo.index.name = "Unidade"
+    return resumo
+
+
+def load_unidades(client, unidades):
+    """
+    Carrega todas as unidades em paralelo e devolve os totais já consolidados.
+    Só o resumo fica no cache de dados; as abas de cada unidade já estão lá.
+
+    Args:
+        client: Cliente do gspread.
+        unidades (tuple): Pares (nome, chave) retornados por `get_unidades()`.
+
+    Returns:
+        tuple: (resumo, erros). `resumo` tem uma linha por unidade; `erros`
+        lista as unidades que não puderam ser carregadas.
+    """
+    def carregar():
+        dados, erros = carregar_abas(client, unidades, ("Respostas_ao_formulario_1", "FLUXO DE CAIXA"))
+        df_form = _preparar_formulario(dados["Respostas_ao_formulario_1"])
+        df_caixa = _preparar_caixa(dados["FLUXO DE CAIXA"])
+        resumo = resumir_unidades(df_form, df_caixa, [nome for nome, _ in unidades])
+        return resumo, erros
+
+    chave = (identidade_client(client), "consolidado", unidades)
+    return get_dataset_cache().obter(chave, carregar, tags=[c for _, c in unidades])